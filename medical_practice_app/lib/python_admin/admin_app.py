@@ -16,14 +16,26 @@ import json
 import secrets
 import string
 import datetime
-import threading
-from typing import List, Dict, Any, Optional, Tuple
+import bisect
+import concurrent.futures
+from urllib.parse import urlparse
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Callable, Set
+
+import requests
+
+# Optional faster JSON decoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Azure imports
 import azure.identity
 import azure.cosmos
 import azure.storage.blob
 import azure.core.exceptions
+from azure.core.pipeline.transport import RequestsTransport
+from azure.core import MatchConditions
 from azure.mgmt.resource import ResourceManagementClient
 from azure.mgmt.cosmosdb import CosmosDBManagementClient
 from azure.mgmt.storage import StorageManagementClient
@@ -41,6 +53,108 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Tcl procedure that appends many (iid, values) rows to a treeview in one
+# interpreter call instead of one Treeview.insert round-trip per row
+TREE_INSERT_ROWS_PROC = """
+proc ::admin_insert_tree_rows {tree rows} {
+    foreach row $rows {
+        lassign $row iid values
+        $tree insert {} end -id $iid -values $values -tags [list $iid]
+    }
+}
+"""
+
+# Settings tab layout: section heading, then (label, config key, default,
+# entry show mask) for each field
+SETTINGS_SECTIONS = (
+    ("Azure AD Settings", (
+        ("Tenant ID:", "azure_tenant_id", "", ""),
+        ("Client ID:", "azure_client_id", "", ""),
+        ("Client Secret:", "azure_client_secret", "", "*"),
+        ("Subscription ID:", "subscription_id", "", "")
+    )),
+    ("Cosmos DB Settings", (
+        ("Cosmos Endpoint:", "cosmos_endpoint", "", ""),
+        ("Cosmos Key:", "cosmos_key", "", "*"),
+        ("Database Name:", "cosmos_database", "medical_practice", ""),
+        ("Users Container:", "cosmos_users_container", "users", "")
+    )),
+    ("Blob Storage Settings", (
+        ("Storage Account:", "storage_account_name", "", ""),
+        ("Storage Key:", "storage_account_key", "", "*")
+    ))
+)
+
+# Doctors treeview text for a linked account, keyed by (exists, active)
+ACCOUNT_STATUS_LABELS = {
+    (True, True): "Yes (Active)",
+    (True, False): "Yes (Inactive)",
+    (False, True): "No (Active)",
+    (False, False): "No (Inactive)"
+}
+
+# Python 3.11+ parses a trailing 'Z' itself, so skip the string rewrite there
+if sys.version_info >= (3, 11):
+    _parse_iso_datetime = datetime.datetime.fromisoformat
+else:
+    def _parse_iso_datetime(value: str) -> datetime.datetime:
+        """Parse an ISO 8601 timestamp, accepting a trailing 'Z' for UTC."""
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# Subscription status by days left: below 0 is expired, below 30 is
+# expiring soon, anything else is active
+SUBSCRIPTION_STATUS_BOUNDS = (0, 30)
+SUBSCRIPTION_STATUSES = ("Expired", "Expiring Soon", "Active")
+
+# Delay before reloading the doctors list after a change, so a burst of
+# changes costs one reload
+RELOAD_DEBOUNCE_MS = 500
+
+# Maximum number of concurrent Azure requests issued by AzureServices. The
+# Cosmos HTTP connection pool is sized to match so workers never queue on it.
+AZURE_IO_MAX_WORKERS = 32
+
+# Character sets for generated credentials
+PASSWORD_ALPHABET = string.ascii_letters + string.digits + string.punctuation
+ACCESS_CODE_ALPHABET = string.ascii_uppercase + string.digits
+
+def _build_byte_table(alphabet: str) -> Tuple[bytes, bytes]:
+    """Build a bytes.translate table mapping random bytes onto alphabet.
+    
+    Returns the translation table and the bytes to delete. Bytes at or above
+    the largest multiple of len(alphabet) are deleted so every character
+    stays equally likely.
+    """
+    limit = 256 - 256 % len(alphabet)
+    table = bytes(ord(alphabet[b % len(alphabet)]) if b < limit else 0 for b in range(256))
+    return table, bytes(range(limit, 256))
+
+PASSWORD_BYTE_TABLE = _build_byte_table(PASSWORD_ALPHABET)
+ACCESS_CODE_BYTE_TABLE = _build_byte_table(ACCESS_CODE_ALPHABET)
+
+# Doctor fields shown in the admin UI. Projecting these keeps the
+# per-doctor settings blob and Cosmos system properties off the wire.
+DOCTOR_LIST_FIELDS = (
+    'id', 'userId', 'email', 'firstName', 'lastName', 'displayName',
+    'speciality', 'phoneNumber', 'address', 'isActive',
+    'hasPharmacyAccount', 'pharmacyAccountId', 'pharmacyAccountActive',
+    'hasLabAccount', 'labAccountId', 'labAccountActive',
+    'subscriptionStartDate', 'subscriptionEndDate', 'subscriptionEndDateEpochMs',
+    'createdAt', 'updatedAt'
+)
+# Doctor fields that update_doctor_account may change
+DOCTOR_UPDATABLE_FIELDS = frozenset({
+    'firstName', 'lastName', 'displayName', 'email', 'speciality',
+    'phoneNumber', 'address', 'isActive', 'hasPharmacyAccount',
+    'hasLabAccount', 'pharmacyAccountActive', 'labAccountActive', 'settings'
+})
+# Cosmos DB rejects a patch request with more operations than this
+COSMOS_PATCH_MAX_OPERATIONS = 10
+DOCTOR_ACCOUNTS_QUERY = (
+    f"SELECT {', '.join(f'c.{field}' for field in DOCTOR_LIST_FIELDS)} "
+    "FROM c WHERE c.role = 'doctor' ORDER BY c.displayName"
+)
+
 class AzureServices:
     """Handles connections to Azure services and provides common operations."""
     
@@ -53,6 +167,18 @@ class AzureServices:
         self.resource_client = None
         self.cosmosdb_client = None
         self.storage_client = None
+        self._credential = None
+        self._database = None
+        self._users_container = None
+        
+        # Settings the current clients were built from, for reconfigure
+        self._applied_config = dict(config)
+        
+        # Shared pool for parallel Azure I/O
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=AZURE_IO_MAX_WORKERS,
+            thread_name_prefix="azure-io"
+        )
         
         self._initialize_clients()
     
@@ -60,199 +186,326 @@ class AzureServices:
         """Initialize all Azure clients."""
         try:
             # Azure AD credentials
-            credential = azure.identity.ClientSecretCredential(
+            self._credential = azure.identity.ClientSecretCredential(
                 tenant_id=self.config['azure_tenant_id'],
                 client_id=self.config['azure_client_id'],
                 client_secret=self.config['azure_client_secret']
             )
             
-            # Initialize Cosmos DB client
-            self.cosmos_client = azure.cosmos.CosmosClient(
-                url=self.config['cosmos_endpoint'],
-                credential=credential
-            )
+            # Warm the credential's token cache in the background so the first
+            # call to each service doesn't wait on Azure AD
+            cosmos_host = urlparse(self.config['cosmos_endpoint']).netloc
+            for scope in (
+                f"https://{cosmos_host}/.default",
+                "https://storage.azure.com/.default",
+                "https://graph.windows.net/.default",
+                "https://management.azure.com/.default"
+            ):
+                self._pool.submit(self._prefetch_token, self._credential, scope)
             
-            # Initialize Blob Storage client
-            self.blob_service_client = azure.storage.blob.BlobServiceClient(
-                account_url=f"https://{self.config['storage_account_name']}.blob.core.windows.net",
-                credential=credential
-            )
+            self._build_cosmos_client()
+            self._build_blob_client()
             
             # Initialize Graph client for Azure AD operations
             self.graph_client = GraphRbacManagementClient(
-                credentials=credential,
+                credentials=self._credential,
                 tenant_id=self.config['azure_tenant_id']
             )
             
-            # Initialize Azure Management clients
-            subscription_id = self.config['subscription_id']
-            self.resource_client = ResourceManagementClient(credential, subscription_id)
-            self.cosmosdb_client = CosmosDBManagementClient(credential, subscription_id)
-            self.storage_client = StorageManagementClient(credential, subscription_id)
+            self._build_management_clients()
             
             logger.info("Azure clients initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Azure clients: {str(e)}")
             raise
     
-    def create_doctor_account(self, doctor_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new doctor account in Azure AD and databases."""
+    def _build_cosmos_client(self) -> None:
+        """Create the Cosmos DB client and resolve the database and users container."""
+        # Initialize Cosmos DB client with a connection pool large enough
+        # for every worker in self._pool
+        cosmos_session = requests.Session()
+        cosmos_session.mount("https://", requests.adapters.HTTPAdapter(
+            pool_connections=AZURE_IO_MAX_WORKERS,
+            pool_maxsize=AZURE_IO_MAX_WORKERS
+        ))
+        self.cosmos_client = azure.cosmos.CosmosClient(
+            url=self.config['cosmos_endpoint'],
+            credential=self._credential,
+            transport=RequestsTransport(session=cosmos_session, session_owner=False),
+            consistency_level='Session',
+            enable_endpoint_discovery=True,
+            preferred_locations=self.config.get('cosmos_preferred_locations') or None
+        )
+        self._resolve_containers()
+    
+    def _resolve_containers(self) -> None:
+        """Resolve the database and users container once; every operation uses them."""
+        self._database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
+        self._users_container = self._database.get_container_client(self.config['cosmos_users_container'])
+    
+    def _build_blob_client(self) -> None:
+        """Create the Blob Storage client."""
+        self.blob_service_client = azure.storage.blob.BlobServiceClient(
+            account_url=f"https://{self.config['storage_account_name']}.blob.core.windows.net",
+            credential=self._credential
+        )
+    
+    def _build_management_clients(self) -> None:
+        """Create the Azure Management clients for the configured subscription."""
+        subscription_id = self.config['subscription_id']
+        self.resource_client = ResourceManagementClient(self._credential, subscription_id)
+        self.cosmosdb_client = CosmosDBManagementClient(self._credential, subscription_id)
+        self.storage_client = StorageManagementClient(self._credential, subscription_id)
+    
+    def reconfigure(self, config: Dict[str, Any]) -> None:
+        """Apply new settings, rebuilding only the clients whose inputs changed.
+        
+        Clients whose settings are unchanged keep their open connections. If a
+        rebuild fails the error propagates and the settings are not recorded as
+        applied, so the next call retries the same rebuild.
+        """
+        changed = {key for key in config.keys() | self._applied_config.keys()
+                   if config.get(key) != self._applied_config.get(key)}
+        self.config = config
+        
+        if changed & {'azure_tenant_id', 'azure_client_id', 'azure_client_secret'}:
+            # Every client authenticates with the credential
+            self._initialize_clients()
+        else:
+            if changed & {'cosmos_endpoint', 'cosmos_preferred_locations'}:
+                self._build_cosmos_client()
+            elif changed & {'cosmos_database', 'cosmos_users_container'}:
+                self._resolve_containers()
+            if 'storage_account_name' in changed:
+                self._build_blob_client()
+            if 'subscription_id' in changed:
+                self._build_management_clients()
+        
+        self._applied_config = dict(config)
+    
+    def _prefetch_token(self, credential: Any, scope: str) -> None:
+        """Fetch a token for scope so the credential caches it."""
         try:
-            # Generate a secure random password
-            password = self._generate_secure_password()
-            
-            # Create Azure AD account for the doctor
-            user_principal_name = f"{doctor_data['email']}"
-            display_name = f"{doctor_data['first_name']} {doctor_data['last_name']}"
-            
-            # Create password profile
-            password_profile = PasswordProfile(
-                password=password,
-                force_change_password_next_login=True
-            )
-            
-            # Create user parameters
-            user_params = UserCreateParameters(
-                user_principal_name=user_principal_name,
-                account_enabled=True,
-                display_name=display_name,
-                mail_nickname=doctor_data['first_name'].lower(),
-                password_profile=password_profile
-            )
-            
-            # Create the user in Azure AD
-            user = self.graph_client.users.create(user_params)
-            
-            # Generate unique IDs for associated accounts
-            doctor_id = str(uuid.uuid4())
-            pharmacy_id = str(uuid.uuid4())
-            
-            # Determine if lab account should be created
-            lab_id = str(uuid.uuid4()) if doctor_data.get('create_lab_account', False) else None
-            
-            # Create doctor record in Cosmos DB
-            doctor_record = {
-                'id': doctor_id,
-                'userId': user.object_id,
-                'email': doctor_data['email'],
-                'firstName': doctor_data['first_name'],
-                'lastName': doctor_data['last_name'],
-                'displayName': display_name,
-                'role': 'doctor',
-                'speciality': doctor_data.get('speciality', ''),
-                'phoneNumber': doctor_data.get('phone_number', ''),
-                'address': doctor_data.get('address', ''),
+            credential.get_token(scope)
+        except Exception as e:
+            logger.warning(f"Failed to prefetch token for {scope}: {str(e)}")
+    
+    def _prepare_doctor_account(self, doctor_data: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Create the Azure AD user for a doctor and build its Cosmos DB records.
+        
+        Returns the records to insert into the users container and the account
+        information to hand back to the caller.
+        """
+        # Generate a secure random password
+        password = self._generate_secure_password()
+        
+        # Create Azure AD account for the doctor
+        user_principal_name = f"{doctor_data['email']}"
+        display_name = f"{doctor_data['first_name']} {doctor_data['last_name']}"
+        
+        # Create password profile
+        password_profile = PasswordProfile(
+            password=password,
+            force_change_password_next_login=True
+        )
+        
+        # Create user parameters
+        user_params = UserCreateParameters(
+            user_principal_name=user_principal_name,
+            account_enabled=True,
+            display_name=display_name,
+            mail_nickname=doctor_data['first_name'].lower(),
+            password_profile=password_profile
+        )
+        
+        # Create the user in Azure AD
+        user = self.graph_client.users.create(user_params)
+        
+        # Generate unique IDs for associated accounts
+        doctor_id = str(uuid.uuid4())
+        pharmacy_id = str(uuid.uuid4())
+        
+        # Determine if lab account should be created
+        lab_id = str(uuid.uuid4()) if doctor_data.get('create_lab_account', False) else None
+        
+        # Timestamps shared by every record in this request
+        now = datetime.datetime.now()
+        end = now + datetime.timedelta(days=365)
+        now_iso = now.isoformat()
+        end_iso = end.isoformat()
+        
+        # Doctor record
+        doctor_record = {
+            'id': doctor_id,
+            'userId': user.object_id,
+            'email': doctor_data['email'],
+            'firstName': doctor_data['first_name'],
+            'lastName': doctor_data['last_name'],
+            'displayName': display_name,
+            'role': 'doctor',
+            'speciality': doctor_data.get('speciality', ''),
+            'phoneNumber': doctor_data.get('phone_number', ''),
+            'address': doctor_data.get('address', ''),
+            'isActive': True,
+            'hasPharmacyAccount': True,
+            'hasLabAccount': lab_id is not None,
+            'pharmacyAccountId': pharmacy_id,
+            'labAccountId': lab_id,
+            'pharmacyAccountActive': True,
+            'labAccountActive': lab_id is not None,
+            'subscriptionStartDate': now_iso,
+            'subscriptionEndDate': end_iso,
+            'subscriptionEndDateEpochMs': int(end.timestamp() * 1000),
+            'createdAt': now_iso,
+            'updatedAt': now_iso,
+            'settings': {}
+        }
+        
+        # Pharmacy account
+        pharmacy_code = self._generate_access_code()
+        pharmacy_record = {
+            'id': pharmacy_id,
+            'doctorId': doctor_id,
+            'name': f"{display_name}'s Pharmacy",
+            'email': f"pharmacy-{doctor_id[:8]}@example.com",
+            'role': 'pharmacy',
+            'accessCode': pharmacy_code,
+            'isActive': True,
+            'createdAt': now_iso,
+            'updatedAt': now_iso
+        }
+        records = [doctor_record, pharmacy_record]
+        
+        # Lab account if requested
+        lab_code = None
+        if lab_id:
+            lab_code = self._generate_access_code()
+            lab_record = {
+                'id': lab_id,
+                'doctorId': doctor_id,
+                'name': f"{display_name}'s Laboratory",
+                'email': f"lab-{doctor_id[:8]}@example.com",
+                'role': 'laboratory',
+                'accessCode': lab_code,
                 'isActive': True,
-                'hasPharmacyAccount': True,
-                'hasLabAccount': lab_id is not None,
-                'pharmacyAccountId': pharmacy_id,
-                'labAccountId': lab_id,
-                'pharmacyAccountActive': True,
-                'labAccountActive': lab_id is not None,
-                'subscriptionStartDate': datetime.datetime.now().isoformat(),
-                'subscriptionEndDate': (datetime.datetime.now() + 
-                                        datetime.timedelta(days=365)).isoformat(),
-                'createdAt': datetime.datetime.now().isoformat(),
-                'updatedAt': datetime.datetime.now().isoformat(),
-                'settings': {}
+                'createdAt': now_iso,
+                'updatedAt': now_iso
             }
+            records.append(lab_record)
+        
+        result = {
+            'doctor_id': doctor_id,
+            'doctor_email': doctor_data['email'],
+            'doctor_password': password,
+            'pharmacy_id': pharmacy_id,
+            'pharmacy_code': pharmacy_code,
+            'lab_id': lab_id,
+            'lab_code': lab_code
+        }
+        
+        return records, result
+    
+    def _create_patients_container(self, doctor_id: str) -> None:
+        """Create the container for a doctor's patients and other data."""
+        self._database.create_container_if_not_exists(
+            id=f"patients-{doctor_id}",
+            partition_key=azure.cosmos.PartitionKey(path="/doctorId")
+        )
+    
+    def create_doctor_account(self, doctor_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new doctor account in Azure AD and databases."""
+        try:
+            records, result = self._prepare_doctor_account(doctor_data)
             
-            # Create a database container for users if it doesn't exist
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
+            # Create container for the doctor's patients and other data. This is a
+            # control-plane call, so run it alongside the record inserts below.
+            container_future = self._pool.submit(self._create_patients_container, result['doctor_id'])
             
-            # Create doctor record
-            users_container.create_item(body=doctor_record)
+            # Create the doctor, pharmacy and lab records
+            for record in records:
+                self._users_container.create_item(body=record)
             
-            # Create pharmacy account
-            pharmacy_code = self._generate_access_code()
-            pharmacy_record = {
-                'id': pharmacy_id,
-                'doctorId': doctor_id,
-                'name': f"{display_name}'s Pharmacy",
-                'email': f"pharmacy-{doctor_id[:8]}@example.com",
-                'role': 'pharmacy',
-                'accessCode': pharmacy_code,
-                'isActive': True,
-                'createdAt': datetime.datetime.now().isoformat(),
-                'updatedAt': datetime.datetime.now().isoformat()
-            }
-            users_container.create_item(body=pharmacy_record)
-            
-            # Create lab account if requested
-            lab_code = None
-            if lab_id:
-                lab_code = self._generate_access_code()
-                lab_record = {
-                    'id': lab_id,
-                    'doctorId': doctor_id,
-                    'name': f"{display_name}'s Laboratory",
-                    'email': f"lab-{doctor_id[:8]}@example.com",
-                    'role': 'laboratory',
-                    'accessCode': lab_code,
-                    'isActive': True,
-                    'createdAt': datetime.datetime.now().isoformat(),
-                    'updatedAt': datetime.datetime.now().isoformat()
-                }
-                users_container.create_item(body=lab_record)
-            
-            # Create container for the doctor's patients and other data
-            patients_container_name = f"patients-{doctor_id}"
-            database.create_container_if_not_exists(
-                id=patients_container_name,
-                partition_key=azure.cosmos.PartitionKey(path="/doctorId")
-            )
+            # Wait for the patients container before reporting success
+            container_future.result()
             
             # Return the created accounts and access codes
-            return {
-                'doctor_id': doctor_id,
-                'doctor_email': doctor_data['email'],
-                'doctor_password': password,
-                'pharmacy_id': pharmacy_id,
-                'pharmacy_code': pharmacy_code,
-                'lab_id': lab_id,
-                'lab_code': lab_code
-            }
+            return result
         
         except Exception as e:
             logger.error(f"Failed to create doctor account: {str(e)}")
             raise
     
+    def ping(self) -> None:
+        """Check that the users container is reachable with the configured credentials."""
+        try:
+            # Container metadata read: constant cost, no documents returned
+            self._users_container.read()
+        except Exception as e:
+            logger.error(f"Failed to reach users container: {str(e)}")
+            raise
+    
     def get_doctor_accounts(self) -> List[Dict[str, Any]]:
-        """Get all doctor accounts."""
+        """Get all doctor accounts, ordered by display name."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
-            # Query for doctor accounts
-            query = "SELECT * FROM c WHERE c.role = 'doctor'"
-            doctors = list(users_container.query_items(query=query, enable_cross_partition_query=True))
+            # Query for doctor accounts, projecting only the fields the UI uses
+            doctors = list(self._users_container.query_items(
+                query=DOCTOR_ACCOUNTS_QUERY,
+                enable_cross_partition_query=True,
+                max_item_count=-1
+            ))
             
             return doctors
         except Exception as e:
             logger.error(f"Failed to get doctor accounts: {str(e)}")
             raise
     
+    def iter_doctor_account_pages(self, page_size: int = 100) -> Iterator[List[Dict[str, Any]]]:
+        """Yield doctor accounts page by page, ordered by display name."""
+        try:
+            pages = self._users_container.query_items(
+                query=DOCTOR_ACCOUNTS_QUERY,
+                enable_cross_partition_query=True,
+                max_item_count=page_size
+            ).by_page()
+            
+            for page in pages:
+                yield list(page)
+        except Exception as e:
+            logger.error(f"Failed to get doctor accounts: {str(e)}")
+            raise
+    
     def update_doctor_account(self, doctor_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a doctor account."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
-            # Get the doctor record
-            doctor_record = users_container.read_item(item=doctor_id, partition_key=doctor_id)
-            
-            # Update the fields
-            for key, value in update_data.items():
-                if key in doctor_record:
-                    doctor_record[key] = value
-            
-            doctor_record['updatedAt'] = datetime.datetime.now().isoformat()
+            # Only send the changed fields that callers are allowed to edit
+            patch_operations = [
+                {'op': 'set', 'path': f'/{key}', 'value': value}
+                for key, value in update_data.items()
+                if key in DOCTOR_UPDATABLE_FIELDS
+            ]
+            patch_operations.append(
+                {'op': 'set', 'path': '/updatedAt', 'value': datetime.datetime.now().isoformat()}
+            )
             
-            # Save the updated record
-            updated_record = users_container.replace_item(item=doctor_id, body=doctor_record)
+            if len(patch_operations) <= COSMOS_PATCH_MAX_OPERATIONS:
+                # Save the updated record
+                return self._users_container.patch_item(
+                    item=doctor_id,
+                    partition_key=doctor_id,
+                    patch_operations=patch_operations
+                )
             
-            return updated_record
+            # Too many fields for one patch: rewrite the whole record instead,
+            # guarded against concurrent writers
+            doctor_record = self._users_container.read_item(item=doctor_id, partition_key=doctor_id)
+            for operation in patch_operations:
+                doctor_record[operation['path'][1:]] = operation['value']
+            return self._users_container.replace_item(
+                item=doctor_id,
+                body=doctor_record,
+                etag=doctor_record['_etag'],
+                match_condition=MatchConditions.IfNotModified
+            )
         except Exception as e:
             logger.error(f"Failed to update doctor account: {str(e)}")
             raise
@@ -261,30 +514,28 @@ class AzureServices:
         """Activate or deactivate a doctor account."""
         return self.update_doctor_account(doctor_id, {'isActive': active})
     
+    def _set_account_active(self, account_id: str, active: bool, updated_at: str) -> None:
+        """Set the active flag on a pharmacy or lab account record."""
+        self._users_container.patch_item(
+            item=account_id,
+            partition_key=account_id,
+            patch_operations=[
+                {'op': 'set', 'path': '/isActive', 'value': active},
+                {'op': 'set', 'path': '/updatedAt', 'value': updated_at}
+            ]
+        )
+    
     def activate_pharmacy_account(self, doctor_id: str, active: bool) -> Dict[str, Any]:
         """Activate or deactivate a pharmacy account associated with a doctor."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
-            # Get the doctor record
-            doctor_record = users_container.read_item(item=doctor_id, partition_key=doctor_id)
-            
-            # Update the doctor record
-            doctor_record['pharmacyAccountActive'] = active
-            doctor_record['updatedAt'] = datetime.datetime.now().isoformat()
-            
-            # Save the updated doctor record
-            updated_doctor = users_container.replace_item(item=doctor_id, body=doctor_record)
+            # Update the doctor record; the patched document carries the pharmacy ID
+            updated_doctor = self.update_doctor_account(doctor_id, {'pharmacyAccountActive': active})
             
             # Update the pharmacy account if it exists
-            if doctor_record.get('pharmacyAccountId'):
-                pharmacy_id = doctor_record['pharmacyAccountId']
+            if updated_doctor.get('pharmacyAccountId'):
+                pharmacy_id = updated_doctor['pharmacyAccountId']
                 try:
-                    pharmacy_record = users_container.read_item(item=pharmacy_id, partition_key=pharmacy_id)
-                    pharmacy_record['isActive'] = active
-                    pharmacy_record['updatedAt'] = datetime.datetime.now().isoformat()
-                    users_container.replace_item(item=pharmacy_id, body=pharmacy_record)
+                    self._set_account_active(pharmacy_id, active, updated_doctor['updatedAt'])
                 except azure.core.exceptions.ResourceNotFoundError:
                     logger.warning(f"Pharmacy account {pharmacy_id} not found")
             
@@ -296,27 +547,14 @@ class AzureServices:
     def activate_lab_account(self, doctor_id: str, active: bool) -> Dict[str, Any]:
         """Activate or deactivate a lab account associated with a doctor."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
-            # Get the doctor record
-            doctor_record = users_container.read_item(item=doctor_id, partition_key=doctor_id)
-            
-            # Update the doctor record
-            doctor_record['labAccountActive'] = active
-            doctor_record['updatedAt'] = datetime.datetime.now().isoformat()
-            
-            # Save the updated doctor record
-            updated_doctor = users_container.replace_item(item=doctor_id, body=doctor_record)
+            # Update the doctor record; the patched document carries the lab ID
+            updated_doctor = self.update_doctor_account(doctor_id, {'labAccountActive': active})
             
             # Update the lab account if it exists
-            if doctor_record.get('labAccountId'):
-                lab_id = doctor_record['labAccountId']
+            if updated_doctor.get('labAccountId'):
+                lab_id = updated_doctor['labAccountId']
                 try:
-                    lab_record = users_container.read_item(item=lab_id, partition_key=lab_id)
-                    lab_record['isActive'] = active
-                    lab_record['updatedAt'] = datetime.datetime.now().isoformat()
-                    users_container.replace_item(item=lab_id, body=lab_record)
+                    self._set_account_active(lab_id, active, updated_doctor['updatedAt'])
                 except azure.core.exceptions.ResourceNotFoundError:
                     logger.warning(f"Lab account {lab_id} not found")
             
@@ -328,11 +566,8 @@ class AzureServices:
     def add_lab_account_to_doctor(self, doctor_id: str) -> Dict[str, Any]:
         """Add a lab account to a doctor who doesn't have one."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
             # Get the doctor record
-            doctor_record = users_container.read_item(item=doctor_id, partition_key=doctor_id)
+            doctor_record = self._users_container.read_item(item=doctor_id, partition_key=doctor_id)
             
             # Check if the doctor already has a lab account
             if doctor_record.get('hasLabAccount', False) and doctor_record.get('labAccountId'):
@@ -343,6 +578,7 @@ class AzureServices:
             lab_code = self._generate_access_code()
             
             display_name = doctor_record.get('displayName', 'Doctor')
+            now_iso = datetime.datetime.now().isoformat()
             
             lab_record = {
                 'id': lab_id,
@@ -352,21 +588,21 @@ class AzureServices:
                 'role': 'laboratory',
                 'accessCode': lab_code,
                 'isActive': True,
-                'createdAt': datetime.datetime.now().isoformat(),
-                'updatedAt': datetime.datetime.now().isoformat()
+                'createdAt': now_iso,
+                'updatedAt': now_iso
             }
             
             # Create the lab account
-            users_container.create_item(body=lab_record)
+            self._users_container.create_item(body=lab_record)
             
             # Update the doctor record
             doctor_record['hasLabAccount'] = True
             doctor_record['labAccountId'] = lab_id
             doctor_record['labAccountActive'] = True
-            doctor_record['updatedAt'] = datetime.datetime.now().isoformat()
+            doctor_record['updatedAt'] = now_iso
             
             # Save the updated doctor record
-            updated_doctor = users_container.replace_item(item=doctor_id, body=doctor_record)
+            updated_doctor = self._users_container.replace_item(item=doctor_id, body=doctor_record)
             
             return {
                 'doctor': updated_doctor,
@@ -380,25 +616,23 @@ class AzureServices:
     def regenerate_access_code(self, account_id: str) -> str:
         """Regenerate access code for a pharmacy or lab account."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
-            # Get the account record
-            account_record = users_container.read_item(item=account_id, partition_key=account_id)
-            
-            # Check if this is a pharmacy or lab account
-            if account_record.get('role') not in ['pharmacy', 'laboratory']:
-                raise ValueError("Account is not a pharmacy or lab account")
-            
             # Generate a new access code
             new_code = self._generate_access_code()
             
-            # Update the account record
-            account_record['accessCode'] = new_code
-            account_record['updatedAt'] = datetime.datetime.now().isoformat()
-            
-            # Save the updated account record
-            users_container.replace_item(item=account_id, body=account_record)
+            # Update only the access code; the filter predicate makes Cosmos
+            # reject the patch unless this is a pharmacy or lab account
+            try:
+                self._users_container.patch_item(
+                    item=account_id,
+                    partition_key=account_id,
+                    patch_operations=[
+                        {'op': 'replace', 'path': '/accessCode', 'value': new_code},
+                        {'op': 'set', 'path': '/updatedAt', 'value': datetime.datetime.now().isoformat()}
+                    ],
+                    filter_predicate="FROM c WHERE c.role IN ('pharmacy', 'laboratory')"
+                )
+            except azure.cosmos.exceptions.CosmosAccessConditionFailedError:
+                raise ValueError("Account is not a pharmacy or lab account")
             
             return new_code
         except Exception as e:
@@ -408,42 +642,55 @@ class AzureServices:
     def update_subscription(self, doctor_id: str, days: int) -> Dict[str, Any]:
         """Update a doctor's subscription by adding days to the end date."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
             # Get the doctor record
-            doctor_record = users_container.read_item(item=doctor_id, partition_key=doctor_id)
+            doctor_record = self._users_container.read_item(item=doctor_id, partition_key=doctor_id)
             
             # Calculate the new end date
+            now = datetime.datetime.now()
+            current_end_ms = doctor_record.get('subscriptionEndDateEpochMs')
             current_end_date = doctor_record.get('subscriptionEndDate')
-            if current_end_date:
-                current_end = datetime.datetime.fromisoformat(current_end_date.replace('Z', '+00:00'))
+            if current_end_ms is not None:
+                current_end = datetime.datetime.fromtimestamp(current_end_ms / 1000)
+            elif current_end_date:
+                current_end = _parse_iso_datetime(current_end_date)
             else:
-                current_end = datetime.datetime.now()
+                current_end = now
                 
             new_end = current_end + datetime.timedelta(days=days)
             
-            # Update the doctor record
-            doctor_record['subscriptionEndDate'] = new_end.isoformat()
-            doctor_record['updatedAt'] = datetime.datetime.now().isoformat()
-            
-            # Save the updated doctor record
-            updated_doctor = users_container.replace_item(item=doctor_id, body=doctor_record)
+            # Update only the subscription fields, guarded against concurrent writers
+            updated_doctor = self._users_container.patch_item(
+                item=doctor_id,
+                partition_key=doctor_id,
+                patch_operations=[
+                    {'op': 'set', 'path': '/subscriptionEndDate', 'value': new_end.isoformat()},
+                    {'op': 'set', 'path': '/subscriptionEndDateEpochMs', 'value': int(new_end.timestamp() * 1000)},
+                    {'op': 'set', 'path': '/updatedAt', 'value': now.isoformat()}
+                ],
+                etag=doctor_record['_etag'],
+                match_condition=MatchConditions.IfNotModified
+            )
             
             return updated_doctor
         except Exception as e:
             logger.error(f"Failed to update subscription: {str(e)}")
             raise
     
+    def _random_string(self, byte_table: Tuple[bytes, bytes], length: int) -> str:
+        """Build a random string of length characters from a byte table."""
+        table, rejected = byte_table
+        chars = b''
+        while len(chars) < length:
+            chars += secrets.token_bytes(length * 2).translate(table, rejected)
+        return chars[:length].decode('ascii')
+    
     def _generate_secure_password(self, length: int = 16) -> str:
         """Generate a secure random password."""
-        alphabet = string.ascii_letters + string.digits + string.punctuation
-        return ''.join(secrets.choice(alphabet) for _ in range(length))
+        return self._random_string(PASSWORD_BYTE_TABLE, length)
     
     def _generate_access_code(self, length: int = 8) -> str:
         """Generate a pharmacy or lab access code."""
-        alphabet = string.ascii_uppercase + string.digits
-        return ''.join(secrets.choice(alphabet) for _ in range(length))
+        return self._random_string(ACCESS_CODE_BYTE_TABLE, length)
 
 
 class AdminApp:
@@ -451,9 +698,37 @@ class AdminApp:
     
     def __init__(self, config_file: str = 'config.json') -> None:
         """Initialize the admin application."""
+        self.config_file = config_file
         self.config = self._load_config(config_file)
         self.azure = AzureServices(self.config)
         
+        # Every loaded subscriptions row as (doctor ID, values), so the
+        # filter can rebuild the treeview without reading rows back out of Tk
+        self._subscription_rows: List[Tuple[str, tuple]] = []
+        
+        # Most recently loaded doctor records, keyed by doctor ID
+        self._doctors_by_id: Dict[str, Dict[str, Any]] = {}
+        
+        # Doctor list loading state: pages from superseded loads are dropped,
+        # and the placeholder row marks trees that still show the old list
+        self._doctors_load_generation = 0
+        self._loading_item: Optional[str] = None
+        
+        # Single worker for doctor list loads, so loads never overlap
+        self._loader = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="doctor-loader")
+        self._pending_load: Optional[concurrent.futures.Future] = None
+        
+        # Pending debounced reload after a change, if any
+        self._reload_after_id: Optional[str] = None
+        
+        # Workers for button actions that call Azure, and the actions still running
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="admin-actions")
+        self._actions_in_flight: Set[Tuple[str, Optional[str]]] = set()
+        
+        # Doctor details dialog, created on first use and reused after that
+        self._details_dialog: Optional[tk.Toplevel] = None
+        self._details_text: Optional[tk.Text] = None
+        
         # Create the main window
         self.root = tk.Tk()
         self.root.title("Medical Practice Admin")
@@ -466,8 +741,12 @@ class AdminApp:
     def _load_config(self, config_file: str) -> Dict[str, Any]:
         """Load configuration from a JSON file."""
         try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
+            if orjson is not None:
+                with open(config_file, 'rb') as f:
+                    config = orjson.loads(f.read())
+            else:
+                with open(config_file, 'r') as f:
+                    config = json.load(f)
             return config
         except FileNotFoundError:
             # Create a default config file if it doesn't exist
@@ -483,8 +762,7 @@ class AdminApp:
                 "storage_account_name": "",
                 "storage_account_key": ""
             }
-            with open(config_file, 'w') as f:
-                json.dump(default_config, f, indent=4)
+            self._write_config(config_file, default_config)
             
             logger.warning(f"Config file not found. Created default config at {config_file}")
             return default_config
@@ -492,8 +770,20 @@ class AdminApp:
             logger.error(f"Failed to load config: {str(e)}")
             raise
     
+    def _write_config(self, config_file: str, config: Dict[str, Any]) -> None:
+        """Write the config through a temporary file so a crash never leaves it half written."""
+        temp_file = f"{config_file}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(config, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, config_file)
+    
     def _setup_ui(self) -> None:
         """Set up the user interface."""
+        # Register the Tcl helper used to insert treeview rows in bulk
+        self.root.tk.eval(TREE_INSERT_ROWS_PROC)
+        
         # Create a notebook with tabs
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -514,8 +804,9 @@ class AdminApp:
         # Set up the subscriptions tab
         self._setup_subscriptions_tab()
         
-        # Set up the settings tab
-        self._setup_settings_tab()
+        # Build the settings tab the first time it is opened
+        self._settings_built = False
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         
         # Load the doctors list
         self._load_doctors()
@@ -661,10 +952,41 @@ class AdminApp:
         self.subscription_menu.add_command(label="Extend Subscription", command=self._extend_subscription)
         self.subscription_menu.add_separator()
         self.subscription_menu.add_command(label="View Doctor Details", command=self._view_doctor_details)
+        self.subscription_menu.add_separator()
+        self.subscription_menu.add_command(label="Refresh", command=self._load_doctors)
         
         # Bind right-click event
         self.subscriptions_tree.bind("<Button-3>", self._on_subscription_right_click)
     
+    def _labelled_entry(
+        self,
+        parent: tk.Widget,
+        row: int,
+        label_text: str,
+        initial: str = "",
+        show: str = "",
+        readonly: bool = False,
+        width: int = 30
+    ) -> ttk.Entry:
+        """Add a labelled entry on a grid row and return the entry.
+        
+        Values are read back with entry.get(), so no Tcl variable is allocated.
+        """
+        ttk.Label(parent, text=label_text).grid(row=row, column=0, sticky="w", padx=5, pady=5)
+        entry = ttk.Entry(parent, width=width, show=show)
+        if initial:
+            entry.insert(0, initial)
+        if readonly:
+            entry.configure(state="readonly")
+        entry.grid(row=row, column=1, sticky="ew", padx=5, pady=5)
+        return entry
+    
+    def _on_tab_changed(self, event) -> None:
+        """Build the settings tab on first selection."""
+        if not self._settings_built and self.notebook.select() == str(self.settings_frame):
+            self._settings_built = True
+            self._setup_settings_tab()
+    
     def _setup_settings_tab(self) -> None:
         """Set up the settings tab UI."""
         # Create a frame for the settings
@@ -675,78 +997,25 @@ class AdminApp:
         container = ttk.Frame(settings_frame)
         container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Create the settings fields
+        # Create the settings fields, with a separator between sections
+        self._setting_entries: Dict[str, ttk.Entry] = {}
+        self._config_snapshot: Dict[str, str] = {}
         row = 0
         
-        # Azure AD settings
-        ttk.Label(container, text="Azure AD Settings", font=("TkDefaultFont", 12, "bold")).grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
-        row += 1
-        
-        ttk.Label(container, text="Tenant ID:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.tenant_id_var = tk.StringVar(value=self.config.get("azure_tenant_id", ""))
-        ttk.Entry(container, textvariable=self.tenant_id_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(container, text="Client ID:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.client_id_var = tk.StringVar(value=self.config.get("azure_client_id", ""))
-        ttk.Entry(container, textvariable=self.client_id_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(container, text="Client Secret:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.client_secret_var = tk.StringVar(value=self.config.get("azure_client_secret", ""))
-        ttk.Entry(container, textvariable=self.client_secret_var, width=50, show="*").grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(container, text="Subscription ID:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.subscription_id_var = tk.StringVar(value=self.config.get("subscription_id", ""))
-        ttk.Entry(container, textvariable=self.subscription_id_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        # Add a separator
-        ttk.Separator(container, orient="horizontal").grid(row=row, column=0, columnspan=2, sticky="ew", pady=10)
-        row += 1
-        
-        # Cosmos DB settings
-        ttk.Label(container, text="Cosmos DB Settings", font=("TkDefaultFont", 12, "bold")).grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
-        row += 1
-        
-        ttk.Label(container, text="Cosmos Endpoint:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.cosmos_endpoint_var = tk.StringVar(value=self.config.get("cosmos_endpoint", ""))
-        ttk.Entry(container, textvariable=self.cosmos_endpoint_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(container, text="Cosmos Key:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.cosmos_key_var = tk.StringVar(value=self.config.get("cosmos_key", ""))
-        ttk.Entry(container, textvariable=self.cosmos_key_var, width=50, show="*").grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(container, text="Database Name:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.cosmos_database_var = tk.StringVar(value=self.config.get("cosmos_database", "medical_practice"))
-        ttk.Entry(container, textvariable=self.cosmos_database_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(container, text="Users Container:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.cosmos_users_container_var = tk.StringVar(value=self.config.get("cosmos_users_container", "users"))
-        ttk.Entry(container, textvariable=self.cosmos_users_container_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        # Add a separator
-        ttk.Separator(container, orient="horizontal").grid(row=row, column=0, columnspan=2, sticky="ew", pady=10)
-        row += 1
-        
-        # Storage settings
-        ttk.Label(container, text="Blob Storage Settings", font=("TkDefaultFont", 12, "bold")).grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
-        row += 1
-        
-        ttk.Label(container, text="Storage Account:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.storage_account_var = tk.StringVar(value=self.config.get("storage_account_name", ""))
-        ttk.Entry(container, textvariable=self.storage_account_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(container, text="Storage Key:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.storage_key_var = tk.StringVar(value=self.config.get("storage_account_key", ""))
-        ttk.Entry(container, textvariable=self.storage_key_var, width=50, show="*").grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
+        for index, (heading, fields) in enumerate(SETTINGS_SECTIONS):
+            if index:
+                ttk.Separator(container, orient="horizontal").grid(row=row, column=0, columnspan=2, sticky="ew", pady=10)
+                row += 1
+            
+            ttk.Label(container, text=heading, font=("TkDefaultFont", 12, "bold")).grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
+            row += 1
+            
+            for label, key, default, show in fields:
+                self._config_snapshot[key] = self.config.get(key, default)
+                self._setting_entries[key] = self._labelled_entry(
+                    container, row, label, self._config_snapshot[key], show=show, width=50
+                )
+                row += 1
         
         # Add save button
         button_frame = ttk.Frame(settings_frame)
@@ -760,53 +1029,100 @@ class AdminApp:
     
     def _load_doctors(self) -> None:
         """Load doctors from the database."""
-        # Clear the treeviews
-        self.doctors_tree.delete(*self.doctors_tree.get_children())
-        self.subscriptions_tree.delete(*self.subscriptions_tree.get_children())
+        # Keep the current rows until the first page arrives and show a
+        # placeholder meanwhile, so the list doesn't flash empty
+        self._doctors_load_generation += 1
+        if self._loading_item is None:
+            self._loading_item = self.doctors_tree.insert("", 0, values=("Loading...",))
         
         try:
-            # Start loading in a separate thread
-            threading.Thread(target=self._load_doctors_thread).start()
+            # Drop a queued load that hasn't started; this one supersedes it
+            if self._pending_load is not None:
+                self._pending_load.cancel()
+            
+            # Load on the loader thread
+            self._pending_load = self._loader.submit(self._load_doctors_thread, self._doctors_load_generation)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load doctors: {str(e)}")
     
-    def _load_doctors_thread(self) -> None:
+    def _schedule_reload(self) -> None:
+        """Reload the doctors list shortly, coalescing bursts of changes into one load."""
+        if self._reload_after_id is not None:
+            self.root.after_cancel(self._reload_after_id)
+        self._reload_after_id = self.root.after(RELOAD_DEBOUNCE_MS, self._do_reload)
+    
+    def _do_reload(self) -> None:
+        """Run a reload scheduled by _schedule_reload."""
+        self._reload_after_id = None
+        self._load_doctors()
+    
+    def _load_doctors_thread(self, generation: int) -> None:
         """Load doctors in a separate thread to avoid blocking the UI."""
         try:
-            # Get doctors from Azure
-            doctors = self.azure.get_doctor_accounts()
-            
-            # Sort doctors by name
-            doctors.sort(key=lambda x: x.get('displayName', ''))
-            
-            # Update the UI in the main thread
-            self.root.after(0, lambda: self._populate_doctor_trees(doctors))
+            # Stream doctors from Azure (already sorted by name), adding each
+            # page to the UI in the main thread as soon as it arrives
+            for page in self.azure.iter_doctor_account_pages():
+                doctor_rows, subscription_rows = self._build_doctor_rows(page)
+                self.root.after_idle(self._populate_doctor_trees, page, doctor_rows, subscription_rows, generation)
+            
+            # Finish up once every page is in
+            self.root.after_idle(self._finish_loading_doctors, generation)
         except Exception as e:
             # Show error message in the main thread
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to load doctors: {str(e)}"))
+            self.root.after_idle(self._remove_loading_item, generation)
+            self.root.after_idle(messagebox.showerror, "Error", f"Failed to load doctors: {str(e)}")
     
-    def _populate_doctor_trees(self, doctors: List[Dict[str, Any]]) -> None:
-        """Populate the treeviews with doctor data."""
-        # Clear the treeviews
+    def _clear_doctor_trees(self) -> None:
+        """Remove every row from both treeviews."""
         self.doctors_tree.delete(*self.doctors_tree.get_children())
         self.subscriptions_tree.delete(*self.subscriptions_tree.get_children())
+        self._subscription_rows.clear()
+        self._doctors_by_id.clear()
+        self._loading_item = None
+    
+    def _remove_loading_item(self, generation: int) -> None:
+        """Drop the placeholder row after a failed load, keeping the old rows."""
+        if generation == self._doctors_load_generation and self._loading_item is not None:
+            self.doctors_tree.delete(self._loading_item)
+            self._loading_item = None
+    
+    def _finish_loading_doctors(self, generation: int) -> None:
+        """Finish a completed load by clearing stale rows."""
+        if generation != self._doctors_load_generation:
+            return
         
-        now = datetime.datetime.now()
+        # No pages arrived, so the old rows are still showing
+        if self._loading_item is not None:
+            self._clear_doctor_trees()
+    
+    def _build_doctor_rows(
+        self,
+        doctors: List[Dict[str, Any]]
+    ) -> Tuple[List[Tuple[str, tuple]], List[Tuple[str, tuple]]]:
+        """Format a page of doctor data into doctors and subscriptions treeview rows.
+        
+        Runs on the loader thread, so it must not touch any Tk objects.
+        """
+        now_ms = int(datetime.datetime.now().timestamp() * 1000)
+        doctor_rows = []
+        subscription_rows = []
         
         for doctor in doctors:
             # Get doctor data
-            doctor_id = doctor.get('id', '')
-            name = doctor.get('displayName', '')
-            email = doctor.get('email', '')
-            is_active = doctor.get('isActive', False)
-            has_pharmacy = doctor.get('hasPharmacyAccount', False)
-            pharmacy_active = doctor.get('pharmacyAccountActive', False)
-            has_lab = doctor.get('hasLabAccount', False)
-            lab_active = doctor.get('labAccountActive', False)
+            get = doctor.get
+            doctor_id = get('id', '')
+            name = get('displayName', '')
+            email = get('email', '')
+            is_active = get('isActive', False)
+            has_pharmacy = get('hasPharmacyAccount', False)
+            pharmacy_active = get('pharmacyAccountActive', False)
+            has_lab = get('hasLabAccount', False)
+            lab_active = get('labAccountActive', False)
             
             # Get subscription data
-            start_date_str = doctor.get('subscriptionStartDate', '')
-            end_date_str = doctor.get('subscriptionEndDate', '')
+            start_date_str = get('subscriptionStartDate', '')
+            end_date_str = get('subscriptionEndDate', '')
+            end_ms = get('subscriptionEndDateEpochMs')
             
             start_date = ""
             end_date = ""
@@ -815,65 +1131,80 @@ class AdminApp:
             
             if start_date_str and end_date_str:
                 try:
-                    start_date_dt = datetime.datetime.fromisoformat(start_date_str.replace('Z', '+00:00'))
-                    end_date_dt = datetime.datetime.fromisoformat(end_date_str.replace('Z', '+00:00'))
+                    # Records written before the epoch field existed still
+                    # need their ISO end date parsed once
+                    if end_ms is None:
+                        end_date_dt = _parse_iso_datetime(end_date_str)
+                        end_ms = int(end_date_dt.timestamp() * 1000)
                     
-                    start_date = start_date_dt.strftime("%Y-%m-%d")
-                    end_date = end_date_dt.strftime("%Y-%m-%d")
+                    # ISO dates start with YYYY-MM-DD
+                    start_date = start_date_str[:10]
+                    end_date = end_date_str[:10]
                     
-                    days_left = (end_date_dt - now).days
+                    days_left = (end_ms - now_ms) // 86400000
                     
-                    if days_left < 0:
-                        subscription_status = "Expired"
-                    elif days_left < 30:
-                        subscription_status = "Expiring Soon"
-                    else:
-                        subscription_status = "Active"
+                    subscription_status = SUBSCRIPTION_STATUSES[bisect.bisect_right(SUBSCRIPTION_STATUS_BOUNDS, days_left)]
+                    
+                    # Keep the parsed dates on the record for the details dialog;
+                    # the record is only displayed, never written back
+                    doctor['_subscriptionDates'] = (start_date, end_date, end_ms)
                 except Exception as e:
                     logger.error(f"Failed to parse dates: {str(e)}")
             
             # Format the status strings
             status = "Active" if is_active else "Inactive"
-            pharmacy = f"{'Yes' if has_pharmacy else 'No'} ({'Active' if pharmacy_active else 'Inactive'})"
-            lab = f"{'Yes' if has_lab else 'No'} ({'Active' if lab_active else 'Inactive'})"
+            pharmacy = ACCOUNT_STATUS_LABELS[bool(has_pharmacy), bool(pharmacy_active)]
+            lab = ACCOUNT_STATUS_LABELS[bool(has_lab), bool(lab_active)]
             subscription = f"{start_date} to {end_date} ({days_left} days left)"
             
-            # Add to doctors treeview
-            self.doctors_tree.insert(
-                "",
-                "end",
-                values=(doctor_id, name, email, status, pharmacy, lab, subscription),
-                tags=(doctor_id,)
-            )
-            
-            # Add to subscriptions treeview
-            self.subscriptions_tree.insert(
-                "",
-                "end",
-                values=(doctor_id, name, email, start_date, end_date, days_left, subscription_status),
-                tags=(doctor_id,)
+            # Queue rows for both treeviews, keyed by doctor ID
+            doctor_rows.append((doctor_id, (doctor_id, name, email, status, pharmacy, lab, subscription)))
+            subscription_rows.append(
+                (doctor_id, (doctor_id, name, email, start_date, end_date, days_left, subscription_status))
             )
         
-        # Apply subscription filter
-        self._filter_subscriptions(None)
+        return doctor_rows, subscription_rows
     
-    def _filter_subscriptions(self, event) -> None:
-        """Filter the subscriptions treeview based on the selected filter."""
-        filter_value = self.subscription_filter.get()
+    def _populate_doctor_trees(
+        self,
+        doctors: List[Dict[str, Any]],
+        doctor_rows: List[Tuple[str, tuple]],
+        subscription_rows: List[Tuple[str, tuple]],
+        generation: int
+    ) -> None:
+        """Append a page of doctor data to the treeviews."""
+        if generation != self._doctors_load_generation:
+            return
         
-        # Show all items
-        for item in self.subscriptions_tree.get_children():
-            self.subscriptions_tree.item(item, open=True)
+        # The first page of a load replaces the previous list
+        if self._loading_item is not None:
+            self._clear_doctor_trees()
         
-        if filter_value == "All":
-            return
+        self._doctors_by_id.update({doctor['id']: doctor for doctor in doctors if doctor.get('id')})
         
-        # Hide items that don't match the filter
-        for item in self.subscriptions_tree.get_children():
-            status = self.subscriptions_tree.item(item, "values")[6]
-            
-            if filter_value != status:
-                self.subscriptions_tree.detach(item)
+        # Insert the whole page with one Tcl call per treeview, showing only
+        # the subscriptions that match the current filter
+        self._subscription_rows.extend(subscription_rows)
+        self._insert_tree_rows(self.doctors_tree, doctor_rows)
+        self._insert_tree_rows(self.subscriptions_tree, self._matching_subscription_rows(subscription_rows))
+    
+    def _insert_tree_rows(self, tree: ttk.Treeview, rows: List[Tuple[str, tuple]]) -> None:
+        """Append (iid, values) rows to a treeview, tagging each row with its iid."""
+        if rows:
+            self.root.tk.call('::admin_insert_tree_rows', str(tree), tuple(rows))
+    
+    def _matching_subscription_rows(self, rows: List[Tuple[str, tuple]]) -> List[Tuple[str, tuple]]:
+        """Return the subscriptions rows that pass the selected filter."""
+        filter_value = self.subscription_filter.get()
+        if filter_value == "All":
+            return rows
+        return [row for row in rows if row[1][6] == filter_value]
+    
+    def _filter_subscriptions(self, event) -> None:
+        """Filter the subscriptions treeview based on the selected filter."""
+        # Rebuild the treeview from the cached rows
+        self.subscriptions_tree.delete(*self.subscriptions_tree.get_children())
+        self._insert_tree_rows(self.subscriptions_tree, self._matching_subscription_rows(self._subscription_rows))
     
     def _on_doctor_double_click(self, event) -> None:
         """Handle double-click on a doctor in the treeview."""
@@ -899,6 +1230,50 @@ class AdminApp:
             self.subscriptions_tree.selection_set(iid)
             self.subscription_menu.post(event.x_root, event.y_root)
     
+    def _run_in_background(
+        self,
+        action: str,
+        work: Callable[[], Any],
+        on_success: Callable[[Any], None],
+        target: Optional[str] = None
+    ) -> None:
+        """Run a blocking Azure call off the UI thread and hand its result back to Tk.
+        
+        While an action is in flight for a target (such as a doctor ID), further
+        requests for the same action and target are refused with a notice, so
+        double clicks don't send the same write twice. Other targets are unaffected.
+        """
+        key = (action, target)
+        if key in self._actions_in_flight:
+            messagebox.showinfo("Info", f"Please wait, the previous request to {action} is still running.")
+            return
+        self._actions_in_flight.add(key)
+        
+        future = self._executor.submit(work)
+        future.add_done_callback(
+            lambda f: self.root.after_idle(self._finish_background, key, f, on_success)
+        )
+    
+    def _finish_background(
+        self,
+        key: Tuple[str, Optional[str]],
+        future: concurrent.futures.Future,
+        on_success: Callable[[Any], None]
+    ) -> None:
+        """Report the outcome of a _run_in_background call on the UI thread."""
+        self._actions_in_flight.discard(key)
+        try:
+            result = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to {key[0]}: {str(e)}")
+            return
+        on_success(result)
+    
+    def _close_dialog(self, dialog: tk.Toplevel) -> None:
+        """Release a modal dialog's grab and destroy it."""
+        dialog.grab_release()
+        dialog.destroy()
+    
     def _show_new_doctor_dialog(self) -> None:
         """Show a dialog to create a new doctor account."""
         # Create a top-level window
@@ -907,35 +1282,19 @@ class AdminApp:
         dialog.geometry("500x400")
         dialog.transient(self.root)
         dialog.grab_set()
+        dialog.protocol("WM_DELETE_WINDOW", lambda: self._close_dialog(dialog))
         
         # Create a frame for the form
         form_frame = ttk.Frame(dialog, padding=10)
         form_frame.pack(fill=tk.BOTH, expand=True)
         
         # Create the form fields
-        ttk.Label(form_frame, text="First Name:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
-        first_name_var = tk.StringVar()
-        ttk.Entry(form_frame, textvariable=first_name_var, width=30).grid(row=0, column=1, sticky="ew", padx=5, pady=5)
-        
-        ttk.Label(form_frame, text="Last Name:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
-        last_name_var = tk.StringVar()
-        ttk.Entry(form_frame, textvariable=last_name_var, width=30).grid(row=1, column=1, sticky="ew", padx=5, pady=5)
-        
-        ttk.Label(form_frame, text="Email:").grid(row=2, column=0, sticky="w", padx=5, pady=5)
-        email_var = tk.StringVar()
-        ttk.Entry(form_frame, textvariable=email_var, width=30).grid(row=2, column=1, sticky="ew", padx=5, pady=5)
-        
-        ttk.Label(form_frame, text="Specialty:").grid(row=3, column=0, sticky="w", padx=5, pady=5)
-        specialty_var = tk.StringVar()
-        ttk.Entry(form_frame, textvariable=specialty_var, width=30).grid(row=3, column=1, sticky="ew", padx=5, pady=5)
-        
-        ttk.Label(form_frame, text="Phone Number:").grid(row=4, column=0, sticky="w", padx=5, pady=5)
-        phone_var = tk.StringVar()
-        ttk.Entry(form_frame, textvariable=phone_var, width=30).grid(row=4, column=1, sticky="ew", padx=5, pady=5)
-        
-        ttk.Label(form_frame, text="Address:").grid(row=5, column=0, sticky="w", padx=5, pady=5)
-        address_var = tk.StringVar()
-        ttk.Entry(form_frame, textvariable=address_var, width=30).grid(row=5, column=1, sticky="ew", padx=5, pady=5)
+        first_name_entry = self._labelled_entry(form_frame, 0, "First Name:")
+        last_name_entry = self._labelled_entry(form_frame, 1, "Last Name:")
+        email_entry = self._labelled_entry(form_frame, 2, "Email:")
+        specialty_entry = self._labelled_entry(form_frame, 3, "Specialty:")
+        phone_entry = self._labelled_entry(form_frame, 4, "Phone Number:")
+        address_entry = self._labelled_entry(form_frame, 5, "Address:")
         
         ttk.Label(form_frame, text="Create Lab Account:").grid(row=6, column=0, sticky="w", padx=5, pady=5)
         create_lab_var = tk.BooleanVar(value=True)
@@ -958,18 +1317,18 @@ class AdminApp:
             command=lambda: self._create_doctor(
                 dialog,
                 result_text,
-                first_name_var.get(),
-                last_name_var.get(),
-                email_var.get(),
-                specialty_var.get(),
-                phone_var.get(),
-                address_var.get(),
+                first_name_entry.get(),
+                last_name_entry.get(),
+                email_entry.get(),
+                specialty_entry.get(),
+                phone_entry.get(),
+                address_entry.get(),
                 create_lab_var.get()
             )
         )
         create_button.pack(side=tk.RIGHT, padx=5)
         
-        cancel_button = ttk.Button(button_frame, text="Close", command=dialog.destroy)
+        cancel_button = ttk.Button(button_frame, text="Close", command=lambda: self._close_dialog(dialog))
         cancel_button.pack(side=tk.RIGHT, padx=5)
     
     def _create_doctor(
@@ -990,101 +1349,83 @@ class AdminApp:
             messagebox.showerror("Error", "First name, last name, and email are required.")
             return
         
-        try:
-            # Create the doctor data
-            doctor_data = {
-                'first_name': first_name,
-                'last_name': last_name,
-                'email': email,
-                'speciality': specialty,
-                'phone_number': phone,
-                'address': address,
-                'create_lab_account': create_lab
-            }
+        # Create the doctor data
+        doctor_data = {
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': email,
+            'speciality': specialty,
+            'phone_number': phone,
+            'address': address,
+            'create_lab_account': create_lab
+        }
+        
+        def on_created(result: Dict[str, Any]) -> None:
+            # Reload the doctors list
+            self._schedule_reload()
             
-            # Create the doctor account
-            result = self.azure.create_doctor_account(doctor_data)
+            # The dialog may have been closed while the account was created
+            if not result_text.winfo_exists():
+                return
             
             # Update the result text
             result_text.config(state=tk.NORMAL)
             result_text.delete(1.0, tk.END)
             
-            result_text.insert(tk.END, "Doctor account created successfully!\n\n")
-            result_text.insert(tk.END, f"Doctor ID: {result['doctor_id']}\n")
-            result_text.insert(tk.END, f"Doctor Email: {result['doctor_email']}\n")
-            result_text.insert(tk.END, f"Doctor Password: {result['doctor_password']}\n\n")
-            result_text.insert(tk.END, f"Pharmacy ID: {result['pharmacy_id']}\n")
-            result_text.insert(tk.END, f"Pharmacy Code: {result['pharmacy_code']}\n\n")
+            lines = [
+                "Doctor account created successfully!\n\n",
+                f"Doctor ID: {result['doctor_id']}\n",
+                f"Doctor Email: {result['doctor_email']}\n",
+                f"Doctor Password: {result['doctor_password']}\n\n",
+                f"Pharmacy ID: {result['pharmacy_id']}\n",
+                f"Pharmacy Code: {result['pharmacy_code']}\n\n"
+            ]
             
             if result['lab_id']:
-                result_text.insert(tk.END, f"Lab ID: {result['lab_id']}\n")
-                result_text.insert(tk.END, f"Lab Code: {result['lab_code']}\n")
+                lines.append(f"Lab ID: {result['lab_id']}\n")
+                lines.append(f"Lab Code: {result['lab_code']}\n")
             
+            # Insert the whole message at once
+            result_text.insert(tk.END, "".join(lines))
             result_text.config(state=tk.DISABLED)
-            
-            # Reload the doctors list
-            self._load_doctors()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create doctor account: {str(e)}")
+        
+        # Create the doctor account
+        self._run_in_background(
+            "create doctor account",
+            lambda: self.azure.create_doctor_account(doctor_data),
+            on_created
+        )
     
     def _edit_selected_doctor(self) -> None:
         """Edit the selected doctor account."""
         # Get the selected doctor
-        selected = self.doctors_tree.selection()
-        if not selected:
-            messagebox.showinfo("Info", "Please select a doctor first.")
+        doctor = self._get_selected_doctor()
+        if not doctor:
             return
         
-        doctor_id = self.doctors_tree.item(selected[0], "values")[0]
+        doctor_id = doctor['id']
         
-        # Get the doctor data
         try:
-            doctors = self.azure.get_doctor_accounts()
-            doctor = next((d for d in doctors if d.get('id') == doctor_id), None)
-            
-            if not doctor:
-                messagebox.showerror("Error", f"Doctor with ID {doctor_id} not found.")
-                return
-            
             # Create a top-level window
             dialog = tk.Toplevel(self.root)
             dialog.title("Edit Doctor")
             dialog.geometry("500x400")
             dialog.transient(self.root)
             dialog.grab_set()
+            dialog.protocol("WM_DELETE_WINDOW", lambda: self._close_dialog(dialog))
             
             # Create a frame for the form
             form_frame = ttk.Frame(dialog, padding=10)
             form_frame.pack(fill=tk.BOTH, expand=True)
             
             # Create the form fields
-            ttk.Label(form_frame, text="ID:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
-            id_var = tk.StringVar(value=doctor.get('id', ''))
-            ttk.Entry(form_frame, textvariable=id_var, width=30, state="readonly").grid(row=0, column=1, sticky="ew", padx=5, pady=5)
-            
-            ttk.Label(form_frame, text="First Name:").grid(row=1, column=0, sticky="w", padx=5, pady=5)
-            first_name_var = tk.StringVar(value=doctor.get('firstName', ''))
-            ttk.Entry(form_frame, textvariable=first_name_var, width=30).grid(row=1, column=1, sticky="ew", padx=5, pady=5)
-            
-            ttk.Label(form_frame, text="Last Name:").grid(row=2, column=0, sticky="w", padx=5, pady=5)
-            last_name_var = tk.StringVar(value=doctor.get('lastName', ''))
-            ttk.Entry(form_frame, textvariable=last_name_var, width=30).grid(row=2, column=1, sticky="ew", padx=5, pady=5)
-            
-            ttk.Label(form_frame, text="Email:").grid(row=3, column=0, sticky="w", padx=5, pady=5)
-            email_var = tk.StringVar(value=doctor.get('email', ''))
-            ttk.Entry(form_frame, textvariable=email_var, width=30).grid(row=3, column=1, sticky="ew", padx=5, pady=5)
-            
-            ttk.Label(form_frame, text="Specialty:").grid(row=4, column=0, sticky="w", padx=5, pady=5)
-            specialty_var = tk.StringVar(value=doctor.get('speciality', ''))
-            ttk.Entry(form_frame, textvariable=specialty_var, width=30).grid(row=4, column=1, sticky="ew", padx=5, pady=5)
-            
-            ttk.Label(form_frame, text="Phone Number:").grid(row=5, column=0, sticky="w", padx=5, pady=5)
-            phone_var = tk.StringVar(value=doctor.get('phoneNumber', ''))
-            ttk.Entry(form_frame, textvariable=phone_var, width=30).grid(row=5, column=1, sticky="ew", padx=5, pady=5)
-            
-            ttk.Label(form_frame, text="Address:").grid(row=6, column=0, sticky="w", padx=5, pady=5)
-            address_var = tk.StringVar(value=doctor.get('address', ''))
-            ttk.Entry(form_frame, textvariable=address_var, width=30).grid(row=6, column=1, sticky="ew", padx=5, pady=5)
+            self._labelled_entry(form_frame, 0, "ID:", doctor.get('id', ''), readonly=True)
+            first_name_entry = self._labelled_entry(form_frame, 1, "First Name:", doctor.get('firstName', ''))
+            last_name_entry = self._labelled_entry(form_frame, 2, "Last Name:", doctor.get('lastName', ''))
+            email_entry = self._labelled_entry(form_frame, 3, "Email:", doctor.get('email', ''))
+            specialty_entry = self._labelled_entry(form_frame, 4, "Specialty:", doctor.get('speciality', ''))
+            phone_entry = self._labelled_entry(form_frame, 5, "Phone Number:", doctor.get('phoneNumber', ''))
+            address_entry = self._labelled_entry(form_frame, 6, "Address:", doctor.get('address', ''))
             
             ttk.Label(form_frame, text="Active:").grid(row=7, column=0, sticky="w", padx=5, pady=5)
             active_var = tk.BooleanVar(value=doctor.get('isActive', False))
@@ -1100,18 +1441,18 @@ class AdminApp:
                 command=lambda: self._update_doctor(
                     dialog,
                     doctor_id,
-                    first_name_var.get(),
-                    last_name_var.get(),
-                    email_var.get(),
-                    specialty_var.get(),
-                    phone_var.get(),
-                    address_var.get(),
+                    first_name_entry.get(),
+                    last_name_entry.get(),
+                    email_entry.get(),
+                    specialty_entry.get(),
+                    phone_entry.get(),
+                    address_entry.get(),
                     active_var.get()
                 )
             )
             save_button.pack(side=tk.RIGHT, padx=5)
             
-            cancel_button = ttk.Button(button_frame, text="Cancel", command=dialog.destroy)
+            cancel_button = ttk.Button(button_frame, text="Cancel", command=lambda: self._close_dialog(dialog))
             cancel_button.pack(side=tk.RIGHT, padx=5)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to get doctor data: {str(e)}")
@@ -1134,231 +1475,256 @@ class AdminApp:
             messagebox.showerror("Error", "First name, last name, and email are required.")
             return
         
-        try:
-            # Create the update data
-            update_data = {
-                'firstName': first_name,
-                'lastName': last_name,
-                'email': email,
-                'speciality': specialty,
-                'phoneNumber': phone,
-                'address': address,
-                'isActive': active,
-                'displayName': f"{first_name} {last_name}"
-            }
-            
-            # Update the doctor account
-            self.azure.update_doctor_account(doctor_id, update_data)
-            
+        # Create the update data
+        update_data = {
+            'firstName': first_name,
+            'lastName': last_name,
+            'email': email,
+            'speciality': specialty,
+            'phoneNumber': phone,
+            'address': address,
+            'isActive': active,
+            'displayName': f"{first_name} {last_name}"
+        }
+        
+        def on_updated(updated_doctor: Dict[str, Any]) -> None:
             # Close the dialog
-            dialog.destroy()
+            if dialog.winfo_exists():
+                self._close_dialog(dialog)
             
             # Reload the doctors list
-            self._load_doctors()
+            self._schedule_reload()
             
             messagebox.showinfo("Success", "Doctor account updated successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update doctor account: {str(e)}")
+        
+        # Update the doctor account
+        self._run_in_background(
+            "update doctor account",
+            lambda: self.azure.update_doctor_account(doctor_id, update_data),
+            on_updated,
+            target=doctor_id
+        )
+    
+    def _get_selected_doctor(self) -> Optional[Dict[str, Any]]:
+        """Return the loaded record for the doctor selected in the doctors treeview."""
+        selected = self.doctors_tree.selection()
+        
+        # Rows use the doctor ID as their item ID
+        doctor = self._doctors_by_id.get(selected[0]) if selected else None
+        if not doctor:
+            messagebox.showinfo("Info", "Please select a doctor first.")
+        return doctor
+    
+    def _update_doctor_row(self, doctor: Dict[str, Any]) -> None:
+        """Replace a doctor's cached record and redraw its rows in both treeviews."""
+        doctor_rows, subscription_rows = self._build_doctor_rows([doctor])
+        doctor_id, values = doctor_rows[0]
+        self._doctors_by_id[doctor_id] = doctor
+        if self.doctors_tree.exists(doctor_id):
+            self.doctors_tree.item(doctor_id, values=values)
+        
+        # Swap the cached subscriptions row
+        subscription_row = subscription_rows[0]
+        for index, (iid, _) in enumerate(self._subscription_rows):
+            if iid == doctor_id:
+                self._subscription_rows[index] = subscription_row
+                break
+        
+        # A new status can move the row in or out of the current filter
+        if self.subscription_filter.get() != "All":
+            self._filter_subscriptions(None)
+        elif self.subscriptions_tree.exists(doctor_id):
+            self.subscriptions_tree.item(doctor_id, values=subscription_row[1])
     
     def _toggle_doctor_status(self) -> None:
         """Toggle the active status of the selected doctor."""
         # Get the selected doctor
-        selected = self.doctors_tree.selection()
-        if not selected:
-            messagebox.showinfo("Info", "Please select a doctor first.")
+        doctor = self._get_selected_doctor()
+        if not doctor:
             return
         
-        doctor_id = self.doctors_tree.item(selected[0], "values")[0]
-        status = self.doctors_tree.item(selected[0], "values")[3]
+        doctor_id = doctor['id']
         
         # Determine the new status
-        new_status = status != "Active"
+        new_status = not doctor.get('isActive', False)
         
-        try:
-            # Update the doctor account
-            self.azure.activate_doctor_account(doctor_id, new_status)
-            
-            # Reload the doctors list
-            self._load_doctors()
+        def on_toggled(updated_doctor: Dict[str, Any]) -> None:
+            # Show the change from the returned record instead of reloading
+            self._update_doctor_row(updated_doctor)
             
             messagebox.showinfo("Success", f"Doctor account {'activated' if new_status else 'deactivated'} successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update doctor status: {str(e)}")
+        
+        # Update the doctor account
+        self._run_in_background(
+            "update doctor status",
+            lambda: self.azure.activate_doctor_account(doctor_id, new_status),
+            on_toggled,
+            target=doctor_id
+        )
     
     def _toggle_pharmacy_status(self) -> None:
         """Toggle the active status of the pharmacy account associated with the selected doctor."""
         # Get the selected doctor
-        selected = self.doctors_tree.selection()
-        if not selected:
-            messagebox.showinfo("Info", "Please select a doctor first.")
+        doctor = self._get_selected_doctor()
+        if not doctor:
             return
         
-        doctor_id = self.doctors_tree.item(selected[0], "values")[0]
-        pharmacy = self.doctors_tree.item(selected[0], "values")[4]
+        doctor_id = doctor['id']
         
-        # Parse the pharmacy status
-        if "Yes" not in pharmacy:
+        # Check the pharmacy account
+        if not doctor.get('hasPharmacyAccount', False):
             messagebox.showinfo("Info", "This doctor does not have a pharmacy account.")
             return
         
         # Determine the new status
-        new_status = "Inactive" in pharmacy
+        new_status = not doctor.get('pharmacyAccountActive', False)
         
-        try:
-            # Update the pharmacy account
-            self.azure.activate_pharmacy_account(doctor_id, new_status)
-            
-            # Reload the doctors list
-            self._load_doctors()
+        def on_toggled(updated_doctor: Dict[str, Any]) -> None:
+            # Show the change from the returned record instead of reloading
+            self._update_doctor_row(updated_doctor)
             
             messagebox.showinfo("Success", f"Pharmacy account {'activated' if new_status else 'deactivated'} successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update pharmacy status: {str(e)}")
+        
+        # Update the pharmacy account
+        self._run_in_background(
+            "update pharmacy status",
+            lambda: self.azure.activate_pharmacy_account(doctor_id, new_status),
+            on_toggled,
+            target=doctor_id
+        )
     
     def _toggle_lab_status(self) -> None:
         """Toggle the active status of the lab account associated with the selected doctor."""
         # Get the selected doctor
-        selected = self.doctors_tree.selection()
-        if not selected:
-            messagebox.showinfo("Info", "Please select a doctor first.")
+        doctor = self._get_selected_doctor()
+        if not doctor:
             return
         
-        doctor_id = self.doctors_tree.item(selected[0], "values")[0]
-        lab = self.doctors_tree.item(selected[0], "values")[5]
+        doctor_id = doctor['id']
         
-        # Parse the lab status
-        if "Yes" not in lab:
+        # Check the lab account
+        if not doctor.get('hasLabAccount', False):
             messagebox.showinfo("Info", "This doctor does not have a lab account.")
             return
         
         # Determine the new status
-        new_status = "Inactive" in lab
+        new_status = not doctor.get('labAccountActive', False)
         
-        try:
-            # Update the lab account
-            self.azure.activate_lab_account(doctor_id, new_status)
-            
-            # Reload the doctors list
-            self._load_doctors()
+        def on_toggled(updated_doctor: Dict[str, Any]) -> None:
+            # Show the change from the returned record instead of reloading
+            self._update_doctor_row(updated_doctor)
             
             messagebox.showinfo("Success", f"Lab account {'activated' if new_status else 'deactivated'} successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update lab status: {str(e)}")
+        
+        # Update the lab account
+        self._run_in_background(
+            "update lab status",
+            lambda: self.azure.activate_lab_account(doctor_id, new_status),
+            on_toggled,
+            target=doctor_id
+        )
     
     def _add_lab_account(self) -> None:
         """Add a lab account to the selected doctor."""
         # Get the selected doctor
-        selected = self.doctors_tree.selection()
-        if not selected:
-            messagebox.showinfo("Info", "Please select a doctor first.")
+        doctor = self._get_selected_doctor()
+        if not doctor:
             return
         
-        doctor_id = self.doctors_tree.item(selected[0], "values")[0]
-        lab = self.doctors_tree.item(selected[0], "values")[5]
+        doctor_id = doctor['id']
         
         # Check if the doctor already has a lab account
-        if "Yes" in lab:
+        if doctor.get('hasLabAccount', False):
             messagebox.showinfo("Info", "This doctor already has a lab account.")
             return
         
-        try:
-            # Add a lab account
-            result = self.azure.add_lab_account_to_doctor(doctor_id)
-            
+        def on_added(result: Dict[str, Any]) -> None:
             # Reload the doctors list
-            self._load_doctors()
+            self._schedule_reload()
             
             # Show a success message with the lab code
             messagebox.showinfo(
                 "Success",
                 f"Lab account added successfully.\n\nLab ID: {result['lab_id']}\nLab Code: {result['lab_code']}"
             )
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add lab account: {str(e)}")
+        
+        # Add a lab account
+        self._run_in_background(
+            "add lab account",
+            lambda: self.azure.add_lab_account_to_doctor(doctor_id),
+            on_added,
+            target=doctor_id
+        )
     
     def _regenerate_pharmacy_code(self) -> None:
         """Regenerate the access code for the pharmacy account associated with the selected doctor."""
         # Get the selected doctor
-        selected = self.doctors_tree.selection()
-        if not selected:
-            messagebox.showinfo("Info", "Please select a doctor first.")
+        doctor = self._get_selected_doctor()
+        if not doctor:
             return
         
-        doctor_id = self.doctors_tree.item(selected[0], "values")[0]
-        pharmacy = self.doctors_tree.item(selected[0], "values")[4]
+        doctor_id = doctor['id']
         
-        # Parse the pharmacy status
-        if "Yes" not in pharmacy:
+        # Check the pharmacy account
+        if not doctor.get('hasPharmacyAccount', False):
             messagebox.showinfo("Info", "This doctor does not have a pharmacy account.")
             return
         
-        try:
-            # Get the doctor data
-            doctors = self.azure.get_doctor_accounts()
-            doctor = next((d for d in doctors if d.get('id') == doctor_id), None)
-            
-            if not doctor:
-                messagebox.showerror("Error", f"Doctor with ID {doctor_id} not found.")
-                return
-            
-            # Get the pharmacy ID
-            pharmacy_id = doctor.get('pharmacyAccountId')
-            if not pharmacy_id:
-                messagebox.showerror("Error", "Pharmacy account ID not found.")
-                return
-            
-            # Regenerate the access code
-            new_code = self.azure.regenerate_access_code(pharmacy_id)
-            
+        # Get the pharmacy ID
+        pharmacy_id = doctor.get('pharmacyAccountId')
+        if not pharmacy_id:
+            messagebox.showerror("Error", "Pharmacy account ID not found.")
+            return
+        
+        def on_regenerated(new_code: str) -> None:
             # Show a success message with the new code
             messagebox.showinfo(
                 "Success",
                 f"Pharmacy access code regenerated successfully.\n\nNew Code: {new_code}"
             )
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to regenerate pharmacy code: {str(e)}")
+        
+        # Regenerate the access code
+        self._run_in_background(
+            "regenerate pharmacy code",
+            lambda: self.azure.regenerate_access_code(pharmacy_id),
+            on_regenerated,
+            target=pharmacy_id
+        )
     
     def _regenerate_lab_code(self) -> None:
         """Regenerate the access code for the lab account associated with the selected doctor."""
         # Get the selected doctor
-        selected = self.doctors_tree.selection()
-        if not selected:
-            messagebox.showinfo("Info", "Please select a doctor first.")
+        doctor = self._get_selected_doctor()
+        if not doctor:
             return
         
-        doctor_id = self.doctors_tree.item(selected[0], "values")[0]
-        lab = self.doctors_tree.item(selected[0], "values")[5]
+        doctor_id = doctor['id']
         
-        # Parse the lab status
-        if "Yes" not in lab:
+        # Check the lab account
+        if not doctor.get('hasLabAccount', False):
             messagebox.showinfo("Info", "This doctor does not have a lab account.")
             return
         
-        try:
-            # Get the doctor data
-            doctors = self.azure.get_doctor_accounts()
-            doctor = next((d for d in doctors if d.get('id') == doctor_id), None)
-            
-            if not doctor:
-                messagebox.showerror("Error", f"Doctor with ID {doctor_id} not found.")
-                return
-            
-            # Get the lab ID
-            lab_id = doctor.get('labAccountId')
-            if not lab_id:
-                messagebox.showerror("Error", "Lab account ID not found.")
-                return
-            
-            # Regenerate the access code
-            new_code = self.azure.regenerate_access_code(lab_id)
-            
+        # Get the lab ID
+        lab_id = doctor.get('labAccountId')
+        if not lab_id:
+            messagebox.showerror("Error", "Lab account ID not found.")
+            return
+        
+        def on_regenerated(new_code: str) -> None:
             # Show a success message with the new code
             messagebox.showinfo(
                 "Success",
                 f"Lab access code regenerated successfully.\n\nNew Code: {new_code}"
             )
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to regenerate lab code: {str(e)}")
+        
+        # Regenerate the access code
+        self._run_in_background(
+            "regenerate lab code",
+            lambda: self.azure.regenerate_access_code(lab_id),
+            on_regenerated,
+            target=lab_id
+        )
     
     def _view_doctor_details(self) -> None:
         """View the details of the selected doctor."""
@@ -1368,88 +1734,110 @@ class AdminApp:
             messagebox.showinfo("Info", "Please select a doctor first.")
             return
         
-        doctor_id = self.doctors_tree.item(selected[0], "values")[0] if selected[0] in self.doctors_tree.get_children() else self.subscriptions_tree.item(selected[0], "values")[0]
+        # Rows in both treeviews use the doctor ID as their iid
+        doctor_id = selected[0]
         
         try:
-            # Get the doctor data
-            doctors = self.azure.get_doctor_accounts()
-            doctor = next((d for d in doctors if d.get('id') == doctor_id), None)
+            # Get the doctor data from the loaded list
+            doctor = self._doctors_by_id.get(doctor_id)
             
             if not doctor:
                 messagebox.showerror("Error", f"Doctor with ID {doctor_id} not found.")
                 return
             
-            # Create a top-level window
-            dialog = tk.Toplevel(self.root)
-            dialog.title("Doctor Details")
-            dialog.geometry("600x500")
-            dialog.transient(self.root)
-            dialog.grab_set()
-            
-            # Create a text widget for the details
-            text = tk.Text(dialog, wrap=tk.WORD, padx=10, pady=10)
-            text.pack(fill=tk.BOTH, expand=True)
-            
-            # Insert the doctor details
-            text.insert(tk.END, f"Doctor ID: {doctor.get('id', '')}\n\n")
-            text.insert(tk.END, f"Name: {doctor.get('displayName', '')}\n")
-            text.insert(tk.END, f"Email: {doctor.get('email', '')}\n")
-            text.insert(tk.END, f"Specialty: {doctor.get('speciality', '')}\n")
-            text.insert(tk.END, f"Phone: {doctor.get('phoneNumber', '')}\n")
-            text.insert(tk.END, f"Address: {doctor.get('address', '')}\n\n")
-            
-            text.insert(tk.END, f"Active: {doctor.get('isActive', False)}\n\n")
+            # Build the doctor details
+            get = doctor.get
+            parts = [
+                f"Doctor ID: {get('id', '')}\n\n",
+                f"Name: {get('displayName', '')}\n",
+                f"Email: {get('email', '')}\n",
+                f"Specialty: {get('speciality', '')}\n",
+                f"Phone: {get('phoneNumber', '')}\n",
+                f"Address: {get('address', '')}\n\n",
+                f"Active: {get('isActive', False)}\n\n"
+            ]
             
             # Subscription details
-            text.insert(tk.END, "Subscription:\n")
-            start_date = doctor.get('subscriptionStartDate', '')
-            end_date = doctor.get('subscriptionEndDate', '')
+            parts.append("Subscription:\n")
+            start_date = get('subscriptionStartDate', '')
+            end_date = get('subscriptionEndDate', '')
             
             if start_date and end_date:
-                try:
-                    start_date_dt = datetime.datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                    end_date_dt = datetime.datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                    
-                    start_date_str = start_date_dt.strftime("%Y-%m-%d")
-                    end_date_str = end_date_dt.strftime("%Y-%m-%d")
-                    
-                    days_left = (end_date_dt - datetime.datetime.now()).days
+                # Dates were parsed when the list was loaded
+                subscription_dates = get('_subscriptionDates')
+                if subscription_dates:
+                    start_date_str, end_date_str, end_ms = subscription_dates
+                    days_left = (end_ms - int(datetime.datetime.now().timestamp() * 1000)) // 86400000
                     
-                    text.insert(tk.END, f"Start Date: {start_date_str}\n")
-                    text.insert(tk.END, f"End Date: {end_date_str}\n")
-                    text.insert(tk.END, f"Days Left: {days_left}\n\n")
-                except Exception as e:
-                    logger.error(f"Failed to parse dates: {str(e)}")
-                    text.insert(tk.END, f"Start Date: {start_date}\n")
-                    text.insert(tk.END, f"End Date: {end_date}\n\n")
+                    parts.append(f"Start Date: {start_date_str}\n")
+                    parts.append(f"End Date: {end_date_str}\n")
+                    parts.append(f"Days Left: {days_left}\n\n")
+                else:
+                    parts.append(f"Start Date: {start_date}\n")
+                    parts.append(f"End Date: {end_date}\n\n")
             
             # Pharmacy account details
-            text.insert(tk.END, "Pharmacy Account:\n")
-            text.insert(tk.END, f"Has Pharmacy Account: {doctor.get('hasPharmacyAccount', False)}\n")
-            text.insert(tk.END, f"Pharmacy Account Active: {doctor.get('pharmacyAccountActive', False)}\n")
-            text.insert(tk.END, f"Pharmacy Account ID: {doctor.get('pharmacyAccountId', '')}\n\n")
+            parts.append("Pharmacy Account:\n")
+            parts.append(f"Has Pharmacy Account: {get('hasPharmacyAccount', False)}\n")
+            parts.append(f"Pharmacy Account Active: {get('pharmacyAccountActive', False)}\n")
+            parts.append(f"Pharmacy Account ID: {get('pharmacyAccountId', '')}\n\n")
             
             # Lab account details
-            text.insert(tk.END, "Lab Account:\n")
-            text.insert(tk.END, f"Has Lab Account: {doctor.get('hasLabAccount', False)}\n")
-            text.insert(tk.END, f"Lab Account Active: {doctor.get('labAccountActive', False)}\n")
-            text.insert(tk.END, f"Lab Account ID: {doctor.get('labAccountId', '')}\n\n")
+            parts.append("Lab Account:\n")
+            parts.append(f"Has Lab Account: {get('hasLabAccount', False)}\n")
+            parts.append(f"Lab Account Active: {get('labAccountActive', False)}\n")
+            parts.append(f"Lab Account ID: {get('labAccountId', '')}\n\n")
             
             # User ID and created/updated dates
-            text.insert(tk.END, "System Information:\n")
-            text.insert(tk.END, f"User ID: {doctor.get('userId', '')}\n")
-            text.insert(tk.END, f"Created At: {doctor.get('createdAt', '')}\n")
-            text.insert(tk.END, f"Updated At: {doctor.get('updatedAt', '')}\n")
+            parts.append("System Information:\n")
+            parts.append(f"User ID: {get('userId', '')}\n")
+            parts.append(f"Created At: {get('createdAt', '')}\n")
+            parts.append(f"Updated At: {get('updatedAt', '')}\n")
+            
+            # Replace the previous details at once
+            text = self._details_text
+            if text is None or not text.winfo_exists():
+                text = self._create_details_dialog()
+            text.config(state=tk.NORMAL)
+            text.delete(1.0, tk.END)
+            text.insert(tk.END, "".join(parts))
             
             # Make the text widget read-only
             text.config(state=tk.DISABLED)
             
-            # Add a close button
-            close_button = ttk.Button(dialog, text="Close", command=dialog.destroy)
-            close_button.pack(pady=10)
+            # Show the dialog
+            self._details_dialog.deiconify()
+            self._details_dialog.lift()
+            self._details_dialog.grab_set()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to get doctor details: {str(e)}")
     
+    def _create_details_dialog(self) -> tk.Text:
+        """Create the doctor details dialog, which is hidden rather than destroyed on close."""
+        # Create a top-level window
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Doctor Details")
+        dialog.geometry("600x500")
+        dialog.transient(self.root)
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_details_dialog)
+        
+        # Create a text widget for the details
+        text = tk.Text(dialog, wrap=tk.WORD, padx=10, pady=10)
+        text.pack(fill=tk.BOTH, expand=True)
+        
+        # Add a close button
+        close_button = ttk.Button(dialog, text="Close", command=self._hide_details_dialog)
+        close_button.pack(pady=10)
+        
+        self._details_dialog = dialog
+        self._details_text = text
+        return text
+    
+    def _hide_details_dialog(self) -> None:
+        """Release the details dialog's grab and hide it for reuse."""
+        self._details_dialog.grab_release()
+        self._details_dialog.withdraw()
+    
     def _extend_subscription(self) -> None:
         """Extend the subscription of the selected doctor."""
         # Get the selected doctor
@@ -1458,7 +1846,7 @@ class AdminApp:
             messagebox.showinfo("Info", "Please select a doctor first.")
             return
         
-        doctor_id = self.subscriptions_tree.item(selected[0], "values")[0]
+        doctor_id = selected[0]
         
         # Ask for the number of days to extend
         days = simpledialog.askinteger(
@@ -1471,57 +1859,65 @@ class AdminApp:
         if not days:
             return
         
-        try:
-            # Update the subscription
-            self.azure.update_subscription(doctor_id, days)
-            
-            # Reload the doctors list
-            self._load_doctors()
+        def on_extended(updated_doctor: Dict[str, Any]) -> None:
+            # Show the new end date from the returned record instead of reloading
+            self._update_doctor_row(updated_doctor)
             
             messagebox.showinfo("Success", f"Subscription extended by {days} days successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to extend subscription: {str(e)}")
+        
+        # Update the subscription
+        self._run_in_background(
+            "extend subscription",
+            lambda: self.azure.update_subscription(doctor_id, days),
+            on_extended,
+            target=doctor_id
+        )
     
-    def _save_settings(self) -> None:
-        """Save the settings to the config file."""
+    def _save_settings(self, on_saved: Optional[Callable[[], None]] = None) -> None:
+        """Save the settings to the config file and reconnect in the background.
+        
+        on_saved runs once the new settings are in use; without it a success
+        message is shown instead.
+        """
+        def on_reconfigured(result: None) -> None:
+            self._config_snapshot = settings
+            if on_saved is not None:
+                on_saved()
+            else:
+                messagebox.showinfo("Success", "Settings saved successfully.")
+        
+        # Nothing to write or reconnect if no field changed
+        settings = {key: entry.get() for key, entry in self._setting_entries.items()}
+        if settings == self._config_snapshot:
+            on_reconfigured(None)
+            return
+        
         try:
-            # Update the config
-            self.config.update({
-                "azure_tenant_id": self.tenant_id_var.get(),
-                "azure_client_id": self.client_id_var.get(),
-                "azure_client_secret": self.client_secret_var.get(),
-                "subscription_id": self.subscription_id_var.get(),
-                "cosmos_endpoint": self.cosmos_endpoint_var.get(),
-                "cosmos_key": self.cosmos_key_var.get(),
-                "cosmos_database": self.cosmos_database_var.get(),
-                "cosmos_users_container": self.cosmos_users_container_var.get(),
-                "storage_account_name": self.storage_account_var.get(),
-                "storage_account_key": self.storage_key_var.get()
-            })
-            
-            # Save the config to file
-            with open('config.json', 'w') as f:
-                json.dump(self.config, f, indent=4)
-            
-            # Reinitialize the Azure services
-            self.azure = AzureServices(self.config)
-            
-            messagebox.showinfo("Success", "Settings saved successfully.")
+            # Update the config and save it to file
+            self.config.update(settings)
+            self._write_config(self.config_file, self.config)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
+            return
+        
+        # Rebuild only the Azure clients affected by the change; this can fetch
+        # new tokens, so keep it off the UI thread
+        config = dict(self.config)
+        self._run_in_background(
+            "save settings",
+            lambda: self.azure.reconfigure(config),
+            on_reconfigured,
+            target="settings"
+        )
     
     def _test_connection(self) -> None:
         """Test the connection to Azure services."""
-        try:
-            # Save the settings first
-            self._save_settings()
-            
-            # Try to get the doctors list
-            self.azure.get_doctor_accounts()
-            
-            messagebox.showinfo("Success", "Connection test successful.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Connection test failed: {str(e)}")
+        # Save the settings first, then check that the users container can be reached
+        self._save_settings(on_saved=lambda: self._run_in_background(
+            "test connection",
+            self.azure.ping,
+            lambda result: messagebox.showinfo("Success", "Connection test successful.")
+        ))
     
     def run(self) -> None:
         """Run the application."""
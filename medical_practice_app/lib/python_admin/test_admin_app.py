@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Tests for the admin application's Azure operations."""
+
+import unittest
+from unittest import mock
+
+# The admin app needs the Azure SDK at import time
+try:
+    import admin_app
+except ImportError:
+    admin_app = None
+
+
+@unittest.skipIf(admin_app is None, "Azure SDK is not installed")
+class UpdateDoctorAccountTest(unittest.TestCase):
+    """update_doctor_account must stay within the Cosmos DB patch operation limit."""
+
+    def setUp(self) -> None:
+        # Skip client construction; only the users container is used
+        self.azure = admin_app.AzureServices.__new__(admin_app.AzureServices)
+        self.azure._users_container = mock.MagicMock()
+
+    def test_few_fields_are_patched(self) -> None:
+        self.azure.update_doctor_account('doctor-1', {'firstName': 'Ada', 'unknown': 1})
+
+        container = self.azure._users_container
+        container.replace_item.assert_not_called()
+        operations = container.patch_item.call_args.kwargs['patch_operations']
+        self.assertEqual([operation['path'] for operation in operations], ['/firstName', '/updatedAt'])
+
+    def test_all_updatable_fields_are_replaced(self) -> None:
+        container = self.azure._users_container
+        container.read_item.return_value = {'id': 'doctor-1', '_etag': 'etag-1', 'role': 'doctor'}
+        update_data = {field: f"new {field}" for field in admin_app.DOCTOR_UPDATABLE_FIELDS}
+
+        self.azure.update_doctor_account('doctor-1', update_data)
+
+        container.patch_item.assert_not_called()
+        kwargs = container.replace_item.call_args.kwargs
+        self.assertEqual(kwargs['etag'], 'etag-1')
+        self.assertEqual(kwargs['match_condition'], admin_app.MatchConditions.IfNotModified)
+        body = kwargs['body']
+        for field, value in update_data.items():
+            self.assertEqual(body[field], value)
+        self.assertEqual(body['role'], 'doctor')
+        self.assertIn('updatedAt', body)
+
+
+if __name__ == "__main__":
+    unittest.main()
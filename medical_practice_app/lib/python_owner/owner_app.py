@@ -8,25 +8,43 @@ for managing the entire Medical Practice Management system in the Azure cloud.
 
 import os
 import sys
+import atexit
 import logging
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
 import uuid
 import json
+import copy
+import functools
 import secrets
+import hmac
 import string
 import datetime
+import time
 import threading
-import hashlib
+import concurrent.futures
 import base64
 import csv
-from typing import List, Dict, Any, Optional, Tuple, Set
+import tempfile
+import zipfile
+import shutil
+import io
+import types
+from urllib.parse import urlparse
+from typing import List, Dict, Any, Optional, Tuple, Set, Iterable, Callable, IO
+
+# Optional faster JSON encoder and decoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Azure imports
 import azure.identity
 import azure.cosmos
 import azure.storage.blob
 import azure.core.exceptions
+from azure.core import MatchConditions
 from azure.mgmt.resource import ResourceManagementClient
 from azure.mgmt.cosmosdb import CosmosDBManagementClient
 from azure.mgmt.storage import StorageManagementClient
@@ -44,50 +62,297 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Password hashing relies on OpenSSL's PBKDF2, which computes the HMAC key pads
+# once per call; refuse to run on the pure-Python fallback, which redoes them
+# on every iteration. This is OpenSSL's PKCS5_PBKDF2_HMAC, whose SHA-256 already
+# uses the CPU's SHA extensions (x86 SHA-NI, ARMv8 SHA2) where present
+try:
+    from _hashlib import pbkdf2_hmac
+except ImportError:
+    raise ImportError("Python's hashlib is not backed by OpenSSL; the owner app requires it for password hashing")
+
+# PBKDF2 settings for owner passwords
+PASSWORD_HASH_NAME = 'sha256'
+PASSWORD_HASH_ITERATIONS = 100000
+PASSWORD_SALT_LENGTH = 32
+PASSWORD_KEY_LENGTH = 32
+
+# Argon2id settings for owner passwords
+ARGON2_HASH_PREFIX = '$argon2'
+
+
+# New password hashes use Argon2id when argon2-cffi is installed; PBKDF2
+# hashes stay verifiable and are upgraded on the next successful login.
+# argon2-cffi loads its native library on import, so that waits until a
+# password is first hashed or checked rather than slowing app startup
+@functools.lru_cache(maxsize=None)
+def _argon2_hasher() -> Optional[Any]:
+    """Return the shared Argon2id hasher, or None if argon2-cffi is not installed."""
+    try:
+        import argon2
+    except ImportError:
+        return None
+    return argon2.PasswordHasher(
+        time_cost=2,
+        memory_cost=64 * 1024,
+        parallelism=2
+    )
+
+# Admin record fields that update_admin_account may change
+ADMIN_UPDATABLE_FIELDS = frozenset({
+    'firstName', 'lastName', 'displayName', 'email', 'isActive', 'permissions'
+})
+
+# Threads for Azure calls that can run side by side, such as per-container scans
+AZURE_IO_MAX_WORKERS = 8
+
+# Upserts queued at a time while restoring a container, so a failure stops the
+# restore after at most one batch instead of after every item has been sent
+RESTORE_UPSERT_BATCH = AZURE_IO_MAX_WORKERS * 4
+
+# Documents fetched per Cosmos DB round trip when paging through query results
+QUERY_PAGE_SIZE = 1000
+
+# JSON helpers for exports, backups, restores and local files; orjson is used when installed
+if orjson is not None:
+    def _json_dumps(obj: Any, indent: bool = False) -> str:
+        """Serialize obj as JSON text, indented by two spaces if indent is set."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+    
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj: Any, indent: bool = False) -> str:
+        """Serialize obj as JSON text, indented by two spaces if indent is set."""
+        return json.dumps(obj, indent=2 if indent else None)
+    
+    _json_loads = json.loads
+
+# Parsed JSON files keyed by path, with the (mtime_ns, size, inode) they were
+# read or written at
+_JSON_FILE_CACHE: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+
+
+def _json_file_version(st: os.stat_result) -> Tuple[int, int, int]:
+    """Return what identifies one version of a file on disk.
+    
+    The inode changes on every atomic replace, so a rewrite is noticed even
+    when the mtime is too coarse to tell it apart.
+    """
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _read_json_file(path: str) -> Dict[str, Any]:
+    """Read a JSON file, reusing the parsed result while the file is unchanged on disk.
+    
+    Callers get their own copy, so they may modify it freely.
+    """
+    version = _json_file_version(os.stat(path))
+    cached = _JSON_FILE_CACHE.get(path)
+    if cached is not None and cached[0] == version:
+        return copy.deepcopy(cached[1])
+    
+    with open(path, 'rb') as f:
+        parsed = _json_loads(f.read())
+    _JSON_FILE_CACHE[path] = (version, parsed)
+    return copy.deepcopy(parsed)
+
+
+def _write_json_file(path: str, obj: Dict[str, Any], indent: bool = True) -> None:
+    """Write a JSON file in one go through a temporary file, so a crash never leaves it half written."""
+    data = _json_dumps(obj, indent=indent).encode('utf-8')
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp_')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    
+    # Remember what was written so the next read neither re-parses nor sees an older version
+    _JSON_FILE_CACHE[path] = (_json_file_version(os.stat(path)), copy.deepcopy(obj))
+
+# Last (epoch second, ISO string) pair handed out by _iso_now_cached
+_ISO_NOW: Tuple[int, str] = (0, '')
+
+
+def _iso_now_cached() -> str:
+    """Return the local time as an ISO string to the second, formatting at most once per second."""
+    global _ISO_NOW
+    cached = _ISO_NOW
+    second = int(time.time())
+    if cached[0] != second:
+        cached = _ISO_NOW = (second, datetime.datetime.fromtimestamp(second).isoformat())
+    return cached[1]
+
+# Container exports larger than this spill from memory to disk while a backup is written
+BACKUP_SPOOL_MAX_BYTES = 16 * 1024 * 1024
+
+# Name of the persistent Azure AD token cache shared across app restarts
+TOKEN_CACHE_NAME = 'owner_app'
+
+# Tcl procedure that appends many (iid, values) rows to a treeview in one
+# interpreter call instead of one Treeview.insert round-trip per row
+TREE_INSERT_ROWS_PROC = """
+proc ::owner_insert_tree_rows {tree rows} {
+    foreach row $rows {
+        lassign $row iid values
+        $tree insert {} end -values $values -tags [list $iid]
+    }
+}
+"""
+
+# Seconds a fetched admin or doctor account list is reused before Azure is queried again
+ACCOUNT_CACHE_TTL = 10.0
+
+# Rows inserted into a treeview per event-loop turn, so a long list fills in
+# progressively instead of freezing the window until every row is added
+TREE_INSERT_CHUNK_ROWS = 500
+
+# Dashboard rows as (caption, metric key); doctors span three rows of counts
+DASHBOARD_ACCOUNT_ROWS = (
+    ("Doctors:", "doctors_active"),
+    ("", "doctors_inactive"),
+    ("", "doctors_total"),
+    ("Admins:", "admins"),
+    ("Pharmacies:", "pharmacies"),
+    ("Labs:", "labs")
+)
+DASHBOARD_DATA_ROWS = (
+    ("Patients:", "patients"),
+    ("Visits:", "visits"),
+    ("Prescriptions:", "prescriptions"),
+    ("Lab Tests:", "lab_tests")
+)
+
+# Settings tab layout: section heading, then (label, config key, default,
+# entry show mask) for each field
+SETTINGS_SECTIONS = (
+    ("Azure AD Settings", (
+        ("Tenant ID:", "azure_tenant_id", "", ""),
+        ("Client ID:", "azure_client_id", "", ""),
+        ("Client Secret:", "azure_client_secret", "", "*"),
+        ("Subscription ID:", "subscription_id", "", "")
+    )),
+    ("Cosmos DB Settings", (
+        ("Cosmos Endpoint:", "cosmos_endpoint", "", ""),
+        ("Cosmos Key:", "cosmos_key", "", "*"),
+        ("Database Name:", "cosmos_database", "medical_practice", ""),
+        ("Users Container:", "cosmos_users_container", "users", "")
+    )),
+    ("Blob Storage Settings", (
+        ("Storage Account:", "storage_account_name", "", ""),
+        ("Storage Key:", "storage_account_key", "", "*")
+    ))
+)
+
+# Config written when owner_config.json is missing; read-only, copy before use
+DEFAULT_CONFIG = types.MappingProxyType({
+    key: default
+    for _, fields in SETTINGS_SECTIONS
+    for _, key, default, _ in fields
+})
+
+# Character sets for generated credentials
+PASSWORD_ALPHABET = string.ascii_letters + string.digits + string.punctuation
+ACCESS_CODE_ALPHABET = string.ascii_uppercase + string.digits
+
+def _build_byte_table(alphabet: str) -> Tuple[bytes, bytes]:
+    """Build a bytes.translate table mapping random bytes onto alphabet.
+    
+    Returns the translation table and the bytes to delete. Bytes at or above
+    the largest multiple of len(alphabet) are deleted so every character
+    stays equally likely.
+    """
+    limit = 256 - 256 % len(alphabet)
+    table = bytes(ord(alphabet[b % len(alphabet)]) if b < limit else 0 for b in range(256))
+    return table, bytes(range(limit, 256))
+
+PASSWORD_BYTE_TABLE = _build_byte_table(PASSWORD_ALPHABET)
+ACCESS_CODE_BYTE_TABLE = _build_byte_table(ACCESS_CODE_ALPHABET)
+
 class SecurityManager:
     """Handles security operations for the owner app."""
     
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash a password using a secure method."""
-        salt = os.urandom(32)
-        key = hashlib.pbkdf2_hmac(
-            'sha256',
+        hasher = _argon2_hasher()
+        if hasher is not None:
+            return hasher.hash(password)
+        
+        salt = os.urandom(PASSWORD_SALT_LENGTH)
+        key = pbkdf2_hmac(
+            PASSWORD_HASH_NAME,
             password.encode('utf-8'),
             salt,
-            100000
+            PASSWORD_HASH_ITERATIONS
         )
         return base64.b64encode(salt + key).decode('utf-8')
     
+    @staticmethod
+    def needs_rehash(stored_password: str) -> bool:
+        """Check if a hash should be replaced with one using the current method and settings."""
+        hasher = _argon2_hasher()
+        if hasher is None:
+            return False
+        if not stored_password.startswith(ARGON2_HASH_PREFIX):
+            return True
+        return hasher.check_needs_rehash(stored_password)
+    
     @staticmethod
     def verify_password(stored_password: str, provided_password: str) -> bool:
         """Verify a password against its hash."""
+        if stored_password.startswith(ARGON2_HASH_PREFIX):
+            hasher = _argon2_hasher()
+            if hasher is None:
+                logger.error("Password verification error: argon2-cffi is required to verify Argon2 hashes")
+                return False
+            from argon2.exceptions import VerificationError, InvalidHashError
+            try:
+                return hasher.verify(stored_password, provided_password)
+            except (VerificationError, InvalidHashError):
+                return False
+        
         try:
             decoded = base64.b64decode(stored_password)
-            salt = decoded[:32]
-            stored_key = decoded[32:]
-            new_key = hashlib.pbkdf2_hmac(
-                'sha256',
+            
+            # Don't spend a full key derivation on a malformed hash
+            if len(decoded) != PASSWORD_SALT_LENGTH + PASSWORD_KEY_LENGTH:
+                logger.error("Password verification error: stored hash has the wrong length")
+                return False
+            
+            salt = decoded[:PASSWORD_SALT_LENGTH]
+            stored_key = decoded[PASSWORD_SALT_LENGTH:]
+            new_key = pbkdf2_hmac(
+                PASSWORD_HASH_NAME,
                 provided_password.encode('utf-8'),
                 salt,
-                100000
+                PASSWORD_HASH_ITERATIONS
             )
-            return stored_key == new_key
-        except Exception as e:
-            logger.error(f"Password verification error: {str(e)}")
+            return hmac.compare_digest(stored_key, new_key)
+        except Exception:
+            logger.exception("Password verification error")
             return False
     
+    @staticmethod
+    def _random_string(byte_table: Tuple[bytes, bytes], length: int) -> str:
+        """Build a random string of length characters from a byte table."""
+        table, rejected = byte_table
+        chars = b''
+        while len(chars) < length:
+            chars += secrets.token_bytes(length * 2).translate(table, rejected)
+        return chars[:length].decode('ascii')
+    
     @staticmethod
     def generate_secure_password(length: int = 16) -> str:
         """Generate a secure random password."""
-        alphabet = string.ascii_letters + string.digits + string.punctuation
-        return ''.join(secrets.choice(alphabet) for _ in range(length))
+        return SecurityManager._random_string(PASSWORD_BYTE_TABLE, length)
     
     @staticmethod
     def generate_access_code(length: int = 8) -> str:
         """Generate an access code."""
-        alphabet = string.ascii_uppercase + string.digits
-        return ''.join(secrets.choice(alphabet) for _ in range(length))
+        return SecurityManager._random_string(ACCESS_CODE_BYTE_TABLE, length)
 
 
 class AzureServices:
@@ -102,25 +367,64 @@ class AzureServices:
         self.resource_client = None
         self.cosmosdb_client = None
         self.storage_client = None
+        self._credential = None
+        self._database = None
+        self._users_container = None
+        
+        # Container clients by name, resolved on first use
+        self._containers: Dict[str, Any] = {}
+        
+        # Shared pool for parallel Azure I/O
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=AZURE_IO_MAX_WORKERS,
+            thread_name_prefix="azure-io"
+        )
         
-        self._initialize_clients()
+        try:
+            self._initialize_clients()
+        except Exception:
+            self.close()
+            raise
     
     def _initialize_clients(self) -> None:
         """Initialize all Azure clients."""
         try:
-            # Azure AD credentials
-            credential = azure.identity.ClientSecretCredential(
+            # Azure AD credentials; tokens are kept in the OS-protected persistent
+            # cache so a restarted app reuses them instead of signing in again
+            credential_options = {}
+            if self.config.get('persist_token_cache', True):
+                credential_options['cache_persistence_options'] = azure.identity.TokenCachePersistenceOptions(
+                    name=TOKEN_CACHE_NAME
+                )
+            credential = self._credential = azure.identity.ClientSecretCredential(
                 tenant_id=self.config['azure_tenant_id'],
                 client_id=self.config['azure_client_id'],
-                client_secret=self.config['azure_client_secret']
+                client_secret=self.config['azure_client_secret'],
+                **credential_options
             )
             
+            # Warm the credential's token cache in the background so the first
+            # call to each service doesn't wait on Azure AD
+            cosmos_host = urlparse(self.config['cosmos_endpoint']).netloc
+            for scope in (
+                f"https://{cosmos_host}/.default",
+                "https://storage.azure.com/.default",
+                "https://graph.windows.net/.default",
+                "https://management.azure.com/.default"
+            ):
+                self._pool.submit(self._prefetch_token, credential, scope)
+            
             # Initialize Cosmos DB client
             self.cosmos_client = azure.cosmos.CosmosClient(
                 url=self.config['cosmos_endpoint'],
                 credential=credential
             )
             
+            # Resolve the database and users container once; every operation uses them
+            self._database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
+            self._users_container = self._database.get_container_client(self.config['cosmos_users_container'])
+            self._containers = {self.config['cosmos_users_container']: self._users_container}
+            
             # Initialize Blob Storage client
             self.blob_service_client = azure.storage.blob.BlobServiceClient(
                 account_url=f"https://{self.config['storage_account_name']}.blob.core.windows.net",
@@ -140,10 +444,44 @@ class AzureServices:
             self.storage_client = StorageManagementClient(credential, subscription_id)
             
             logger.info("Azure clients initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Azure clients: {str(e)}")
+        except Exception:
+            logger.exception("Failed to initialize Azure clients")
             raise
     
+    def close(self) -> None:
+        """Stop the worker pool and close the clients' connections.
+        
+        Call this before dropping the instance; running pool tasks finish on
+        their own.
+        """
+        self._pool.shutdown(wait=False)
+        
+        # The sync CosmosClient has no close(); its context manager exit closes the pipeline
+        closers = [] if self.cosmos_client is None else [lambda: self.cosmos_client.__exit__(None, None, None)]
+        closers.extend(client.close for client in (
+            self.blob_service_client, self.graph_client, self.resource_client,
+            self.cosmosdb_client, self.storage_client, self._credential
+        ) if client is not None)
+        for close in closers:
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Failed to close Azure client: {str(e)}")
+    
+    def _container(self, container_name: str) -> Any:
+        """Return the client for a container in the database, reusing earlier ones."""
+        container = self._containers.get(container_name)
+        if container is None:
+            container = self._containers[container_name] = self._database.get_container_client(container_name)
+        return container
+    
+    def _prefetch_token(self, credential: Any, scope: str) -> None:
+        """Fetch a token for scope so the credential caches it."""
+        try:
+            credential.get_token(scope)
+        except Exception as e:
+            logger.warning(f"Failed to prefetch token for {scope}: {str(e)}")
+    
     def create_admin_account(self, admin_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new admin account in Azure AD and databases."""
         try:
@@ -176,6 +514,7 @@ class AzureServices:
             admin_id = str(uuid.uuid4())
             
             # Create admin record in Cosmos DB
+            now_iso = datetime.datetime.now().isoformat()
             admin_record = {
                 'id': admin_id,
                 'userId': user.object_id,
@@ -190,16 +529,12 @@ class AzureServices:
                     'viewReports': True,
                     'manageSettings': True
                 }),
-                'createdAt': datetime.datetime.now().isoformat(),
-                'updatedAt': datetime.datetime.now().isoformat(),
+                'createdAt': now_iso,
+                'updatedAt': now_iso,
             }
             
-            # Create a database container for users if it doesn't exist
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
             # Create admin record
-            users_container.create_item(body=admin_record)
+            self._users_container.create_item(body=admin_record)
             
             # Return the created account
             return {
@@ -208,48 +543,51 @@ class AzureServices:
                 'admin_password': password,
             }
         
-        except Exception as e:
-            logger.error(f"Failed to create admin account: {str(e)}")
+        except Exception:
+            logger.exception("Failed to create admin account")
             raise
     
     def get_admin_accounts(self) -> List[Dict[str, Any]]:
         """Get all admin accounts."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
             # Query for admin accounts
             query = "SELECT * FROM c WHERE c.role = 'admin'"
-            admins = list(users_container.query_items(query=query, enable_cross_partition_query=True))
+            admins = list(self._users_container.query_items(
+                query=query,
+                enable_cross_partition_query=True,
+                max_item_count=QUERY_PAGE_SIZE
+            ))
             
             return admins
-        except Exception as e:
-            logger.error(f"Failed to get admin accounts: {str(e)}")
+        except Exception:
+            logger.exception("Failed to get admin accounts")
             raise
     
     def update_admin_account(self, admin_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update an admin account."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
-            # Get the admin record
-            admin_record = users_container.read_item(item=admin_id, partition_key=admin_id)
+            # Only send the fields an admin record has
+            patch_operations = [
+                {'op': 'set', 'path': f'/{key}', 'value': value}
+                for key, value in update_data.items()
+                if key in ADMIN_UPDATABLE_FIELDS
+            ]
+            patch_operations.append(
+                {'op': 'set', 'path': '/updatedAt', 'value': datetime.datetime.now().isoformat()}
+            )
             
-            # Make sure this is an admin account
-            if admin_record.get('role') != 'admin':
+            # Save the updated fields; the filter predicate makes Cosmos
+            # reject the patch unless this is an admin account
+            try:
+                admin_record = self._users_container.patch_item(
+                    item=admin_id,
+                    partition_key=admin_id,
+                    patch_operations=patch_operations,
+                    filter_predicate="FROM c WHERE c.role = 'admin'"
+                )
+            except azure.cosmos.exceptions.CosmosAccessConditionFailedError:
                 raise ValueError("The account is not an admin account")
             
-            # Update the fields
-            for key, value in update_data.items():
-                if key in admin_record:
-                    admin_record[key] = value
-            
-            admin_record['updatedAt'] = datetime.datetime.now().isoformat()
-            
-            # Save the updated record
-            updated_record = users_container.replace_item(item=admin_id, body=admin_record)
-            
             # If needed, update Azure AD user as well
             if 'firstName' in update_data or 'lastName' in update_data or 'email' in update_data:
                 display_name = f"{admin_record['firstName']} {admin_record['lastName']}"
@@ -266,99 +604,95 @@ class AzureServices:
                 
                 self.graph_client.users.update(admin_record['userId'], user_params)
             
-            return updated_record
-        except Exception as e:
-            logger.error(f"Failed to update admin account: {str(e)}")
+            return admin_record
+        except Exception:
+            logger.exception("Failed to update admin account")
             raise
     
     def delete_admin_account(self, admin_id: str) -> bool:
         """Delete an admin account."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
-            # Get the admin record
-            admin_record = users_container.read_item(item=admin_id, partition_key=admin_id)
+            # Get the admin record; its userId is needed to delete the Azure AD user
+            admin_record = self._users_container.read_item(item=admin_id, partition_key=admin_id)
             
             # Make sure this is an admin account
             if admin_record.get('role') != 'admin':
                 raise ValueError("The account is not an admin account")
             
-            # Delete the admin record
-            users_container.delete_item(item=admin_id, partition_key=admin_id)
+            # Delete the admin record, unless it changed since it was read
+            self._users_container.delete_item(
+                item=admin_id,
+                partition_key=admin_id,
+                etag=admin_record['_etag'],
+                match_condition=MatchConditions.IfNotModified
+            )
             
             # Delete Azure AD user
             self.graph_client.users.delete(admin_record['userId'])
             
             return True
-        except Exception as e:
-            logger.error(f"Failed to delete admin account: {str(e)}")
+        except Exception:
+            logger.exception("Failed to delete admin account")
             raise
     
     def get_doctor_accounts(self) -> List[Dict[str, Any]]:
         """Get all doctor accounts."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
             # Query for doctor accounts
             query = "SELECT * FROM c WHERE c.role = 'doctor'"
-            doctors = list(users_container.query_items(query=query, enable_cross_partition_query=True))
+            doctors = list(self._users_container.query_items(
+                query=query,
+                enable_cross_partition_query=True,
+                max_item_count=QUERY_PAGE_SIZE
+            ))
             
             return doctors
-        except Exception as e:
-            logger.error(f"Failed to get doctor accounts: {str(e)}")
+        except Exception:
+            logger.exception("Failed to get doctor accounts")
             raise
     
     def deactivate_all_accounts_for_doctor(self, doctor_id: str) -> bool:
         """Deactivate a doctor account and all associated accounts."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
+            updated_at = datetime.datetime.now().isoformat()
             
-            # Get the doctor record
-            doctor_record = users_container.read_item(item=doctor_id, partition_key=doctor_id)
+            # Update doctor record; the patched record tells which linked accounts exist
+            doctor_record = self._set_account_inactive(doctor_id, updated_at)
             
-            # Update doctor record
-            doctor_record['isActive'] = False
-            doctor_record['updatedAt'] = datetime.datetime.now().isoformat()
-            users_container.replace_item(item=doctor_id, body=doctor_record)
-            
-            # Update pharmacy account if it exists
-            if doctor_record.get('pharmacyAccountId'):
-                pharmacy_id = doctor_record['pharmacyAccountId']
-                try:
-                    pharmacy_record = users_container.read_item(item=pharmacy_id, partition_key=pharmacy_id)
-                    pharmacy_record['isActive'] = False
-                    pharmacy_record['updatedAt'] = datetime.datetime.now().isoformat()
-                    users_container.replace_item(item=pharmacy_id, body=pharmacy_record)
-                except azure.core.exceptions.ResourceNotFoundError:
-                    logger.warning(f"Pharmacy account {pharmacy_id} not found")
-            
-            # Update lab account if it exists
-            if doctor_record.get('labAccountId'):
-                lab_id = doctor_record['labAccountId']
+            # Update the pharmacy and lab accounts side by side if they exist
+            futures = {
+                self._pool.submit(self._set_account_inactive, doctor_record[key], updated_at): (label, doctor_record[key])
+                for key, label in (('pharmacyAccountId', 'Pharmacy'), ('labAccountId', 'Lab'))
+                if doctor_record.get(key)
+            }
+            for future in concurrent.futures.as_completed(futures):
+                label, account_id = futures[future]
                 try:
-                    lab_record = users_container.read_item(item=lab_id, partition_key=lab_id)
-                    lab_record['isActive'] = False
-                    lab_record['updatedAt'] = datetime.datetime.now().isoformat()
-                    users_container.replace_item(item=lab_id, body=lab_record)
+                    future.result()
                 except azure.core.exceptions.ResourceNotFoundError:
-                    logger.warning(f"Lab account {lab_id} not found")
+                    logger.warning(f"{label} account {account_id} not found")
             
             return True
-        except Exception as e:
-            logger.error(f"Failed to deactivate accounts: {str(e)}")
+        except Exception:
+            logger.exception("Failed to deactivate accounts")
             raise
     
+    def _set_account_inactive(self, account_id: str, updated_at: str) -> Dict[str, Any]:
+        """Clear the active flag on an account record and return the patched record."""
+        return self._users_container.patch_item(
+            item=account_id,
+            partition_key=account_id,
+            patch_operations=[
+                {'op': 'set', 'path': '/isActive', 'value': False},
+                {'op': 'set', 'path': '/updatedAt', 'value': updated_at}
+            ]
+        )
+    
     def reset_password(self, user_id: str) -> str:
         """Reset the password for a user in Azure AD."""
         try:
             # Get the user record from Cosmos DB
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
-            user_record = users_container.read_item(item=user_id, partition_key=user_id)
+            user_record = self._users_container.read_item(item=user_id, partition_key=user_id)
             
             # Generate a new password
             new_password = SecurityManager.generate_secure_password()
@@ -377,21 +711,21 @@ class AzureServices:
             self.graph_client.users.update(user_record['userId'], user_params)
             
             return new_password
-        except Exception as e:
-            logger.error(f"Failed to reset password: {str(e)}")
+        except Exception:
+            logger.exception("Failed to reset password")
             raise
     
     def export_data(self, collection_name: str, output_format: str) -> str:
         """Export data from a Cosmos DB collection to CSV or JSON."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            container = database.get_container_client(collection_name)
+            container = self._container(collection_name)
             
-            # Query all documents
-            items = list(container.query_items(
+            # Query all documents; results are streamed page by page
+            items = container.query_items(
                 query="SELECT * FROM c",
-                enable_cross_partition_query=True
-            ))
+                enable_cross_partition_query=True,
+                max_item_count=QUERY_PAGE_SIZE
+            )
             
             # Create temp directory if it doesn't exist
             os.makedirs("exports", exist_ok=True)
@@ -403,102 +737,118 @@ class AzureServices:
             if output_format.lower() == "json":
                 # Export as JSON
                 with open(filename, "w") as f:
-                    json.dump(items, f, indent=2)
+                    self._write_json_array(f, items)
             
             elif output_format.lower() == "csv":
-                # Export as CSV
-                if not items:
-                    # If no items, create empty file
-                    with open(filename, "w") as f:
-                        f.write("No data found")
-                    return filename
-                
-                # Get all possible columns
+                # The header needs every column, so spool the documents to a
+                # temporary JSON lines file while collecting them
                 columns = set()
-                for item in items:
-                    columns.update(item.keys())
-                
-                # Sort columns for consistency, with 'id' first
-                if 'id' in columns:
-                    columns.remove('id')
-                sorted_columns = ['id'] + sorted(columns)
-                
-                # Write to CSV
-                with open(filename, "w", newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=sorted_columns)
-                    writer.writeheader()
+                with tempfile.TemporaryFile("w+") as spool:
                     for item in items:
-                        # Ensure consistent column order
-                        row = {col: item.get(col, '') for col in sorted_columns}
-                        writer.writerow(row)
+                        columns.update(item.keys())
+                        spool.write(_json_dumps(item))
+                        spool.write("\n")
+                    
+                    if not columns:
+                        # If no items, create empty file
+                        with open(filename, "w") as f:
+                            f.write("No data found")
+                        return filename
+                    
+                    # Sort columns for consistency, with 'id' first
+                    if 'id' in columns:
+                        columns.remove('id')
+                    sorted_columns = ['id'] + sorted(columns)
+                    
+                    # Write to CSV; the writer orders each row's fields and
+                    # fills missing ones with an empty string
+                    spool.seek(0)
+                    with open(filename, "w", newline='') as f:
+                        writer = csv.DictWriter(f, fieldnames=sorted_columns, restval='')
+                        writer.writeheader()
+                        writer.writerows(map(_json_loads, spool))
             
             else:
                 raise ValueError(f"Unsupported format: {output_format}")
             
             return filename
-        except Exception as e:
-            logger.error(f"Failed to export data: {str(e)}")
+        except Exception:
+            logger.exception("Failed to export data")
             raise
     
+    def _write_json_array(self, f: IO[str], items: Iterable[Dict[str, Any]]) -> None:
+        """Write documents to a file as a JSON array, one document at a time."""
+        f.write("[")
+        for index, item in enumerate(items):
+            f.write(",\n" if index else "\n")
+            f.write(_json_dumps(item, indent=True))
+        f.write("\n]")
+    
+    def _dump_container(self, container_name: str) -> IO[str]:
+        """Write every document in a container to a spool file, rewound for reading.
+        
+        The spool stays in memory for small containers and moves to disk past
+        BACKUP_SPOOL_MAX_BYTES.
+        """
+        container = self._container(container_name)
+        
+        # Query all documents; results are streamed page by page
+        items = container.query_items(
+            query="SELECT * FROM c",
+            enable_cross_partition_query=True,
+            max_item_count=QUERY_PAGE_SIZE
+        )
+        
+        # Export as JSON
+        spool = tempfile.SpooledTemporaryFile(max_size=BACKUP_SPOOL_MAX_BYTES, mode="w+", encoding="utf-8")
+        self._write_json_array(spool, items)
+        spool.seek(0)
+        return spool
+    
     def backup_database(self) -> str:
         """Create a full backup of the Cosmos DB database."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            
             # Get all containers
-            containers = list(database.list_containers())
+            containers = list(self._database.list_containers())
             
-            # Create backup directory
+            # Write the backup straight into the archive
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_dir = f"backups/backup_{timestamp}"
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            # Export each container
-            for container_info in containers:
-                container_name = container_info['id']
-                container = database.get_container_client(container_name)
-                
-                # Query all documents
-                items = list(container.query_items(
-                    query="SELECT * FROM c",
-                    enable_cross_partition_query=True
-                ))
-                
-                # Export as JSON
-                filename = f"{backup_dir}/{container_name}.json"
-                with open(filename, "w") as f:
-                    json.dump(items, f, indent=2)
-            
-            # Create a manifest file
-            manifest = {
-                'timestamp': timestamp,
-                'database': self.config['cosmos_database'],
-                'containers': [c['id'] for c in containers],
-                'total_containers': len(containers)
-            }
-            
-            with open(f"{backup_dir}/manifest.json", "w") as f:
-                json.dump(manifest, f, indent=2)
-            
-            # Create a ZIP archive
-            import shutil
+            os.makedirs("backups", exist_ok=True)
             backup_zip = f"backups/backup_{timestamp}.zip"
-            shutil.make_archive(f"backups/backup_{timestamp}", 'zip', backup_dir)
-            
-            # Clean up the temporary directory
-            shutil.rmtree(backup_dir)
+            container_names = [c['id'] for c in containers]
+            
+            try:
+                with zipfile.ZipFile(backup_zip, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+                    # Export the containers in parallel; the archive takes one entry at a time.
+                    # A streamed entry's size isn't known up front, so always allow ZIP64
+                    # in case a container's JSON passes 2 GiB
+                    for container_name, spool in zip(container_names, self._pool.map(self._dump_container, container_names)):
+                        with spool, zf.open(f"{container_name}.json", 'w', force_zip64=True) as entry:
+                            with io.TextIOWrapper(entry, encoding="utf-8") as text:
+                                shutil.copyfileobj(spool, text)
+                    
+                    # Create a manifest file
+                    manifest = {
+                        'timestamp': timestamp,
+                        'database': self.config['cosmos_database'],
+                        'containers': container_names,
+                        'total_containers': len(containers)
+                    }
+                    zf.writestr("manifest.json", _json_dumps(manifest, indent=True))
+            except Exception:
+                # Don't leave a partial archive that looks like a backup
+                if os.path.exists(backup_zip):
+                    os.remove(backup_zip)
+                raise
             
             return backup_zip
-        except Exception as e:
-            logger.error(f"Failed to backup database: {str(e)}")
+        except Exception:
+            logger.exception("Failed to backup database")
             raise
     
     def restore_database(self, backup_file: str) -> bool:
         """Restore a Cosmos DB database from backup."""
         try:
-            import zipfile
-            import tempfile
-            
             # Create a temporary directory
             with tempfile.TemporaryDirectory() as temp_dir:
                 # Extract the ZIP archive
@@ -506,88 +856,96 @@ class AzureServices:
                     zip_ref.extractall(temp_dir)
                 
                 # Read the manifest
-                with open(f"{temp_dir}/manifest.json", "r") as f:
-                    manifest = json.load(f)
-                
-                database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
+                with open(f"{temp_dir}/manifest.json", "rb") as f:
+                    manifest = _json_loads(f.read())
                 
                 # Restore each container
                 for container_name in manifest['containers']:
                     # Read the backup data
-                    with open(f"{temp_dir}/{container_name}.json", "r") as f:
-                        items = json.load(f)
+                    with open(f"{temp_dir}/{container_name}.json", "rb") as f:
+                        items = _json_loads(f.read())
                     
                     # Ensure the container exists
                     try:
-                        container = database.get_container_client(container_name)
+                        container = self._container(container_name)
                     except azure.core.exceptions.ResourceNotFoundError:
                         # Create the container if it doesn't exist
-                        database.create_container(
+                        self._database.create_container(
                             id=container_name,
                             partition_key=azure.cosmos.PartitionKey(path="/id")
                         )
-                        container = database.get_container_client(container_name)
+                        container = self._container(container_name)
                     
-                    # Restore each item
-                    for item in items:
-                        try:
-                            # Try to read the item to see if it exists
-                            container.read_item(item=item['id'], partition_key=item['id'])
-                            
-                            # If it exists, replace it
-                            container.replace_item(item=item['id'], body=item)
-                        except azure.core.exceptions.ResourceNotFoundError:
-                            # If it doesn't exist, create it
-                            container.create_item(body=item)
+                    # Restore each item, creating or replacing it in one call; the
+                    # upserts run on the shared pool a batch at a time, and on the
+                    # first failure the rest of the batch is cancelled and it is raised
+                    for start in range(0, len(items), RESTORE_UPSERT_BATCH):
+                        futures = [
+                            self._pool.submit(container.upsert_item, body=item)
+                            for item in items[start:start + RESTORE_UPSERT_BATCH]
+                        ]
+                        done, pending = concurrent.futures.wait(
+                            futures, return_when=concurrent.futures.FIRST_EXCEPTION
+                        )
+                        for future in pending:
+                            future.cancel()
+                        for future in done:
+                            future.result()
             
             return True
-        except Exception as e:
-            logger.error(f"Failed to restore database: {str(e)}")
+        except Exception:
+            logger.exception("Failed to restore database")
             raise
     
+    def _count_patient_data(self, container_name: str) -> Dict[str, int]:
+        """Count the non-deleted documents of each type in a patients container."""
+        container = self._container(container_name)
+        
+        # Count patients, visits, prescriptions and lab tests in one query
+        query_types = "SELECT c.type, COUNT(1) AS n FROM c WHERE c.isDeleted = false GROUP BY c.type"
+        try:
+            return {
+                group.get('type'): group['n']
+                for group in container.query_items(
+                    query=query_types,
+                    enable_cross_partition_query=True
+                )
+            }
+        except:
+            # Skip if the query fails (e.g., if the container doesn't have the expected schema)
+            return {}
+    
     def get_system_metrics(self) -> Dict[str, Any]:
         """Get system-wide metrics for the medical practice management system."""
         try:
-            database = self.cosmos_client.get_database_client(self.config['cosmos_database'])
-            users_container = database.get_container_client(self.config['cosmos_users_container'])
-            
-            # Count active doctors
-            query_doctors = "SELECT VALUE COUNT(1) FROM c WHERE c.role = 'doctor' AND c.isActive = true"
-            active_doctors_count = list(users_container.query_items(
-                query=query_doctors,
-                enable_cross_partition_query=True
-            ))[0]
-            
-            # Count inactive doctors
-            query_inactive_doctors = "SELECT VALUE COUNT(1) FROM c WHERE c.role = 'doctor' AND c.isActive = false"
-            inactive_doctors_count = list(users_container.query_items(
-                query=query_inactive_doctors,
-                enable_cross_partition_query=True
-            ))[0]
-            
-            # Count admins
-            query_admins = "SELECT VALUE COUNT(1) FROM c WHERE c.role = 'admin'"
-            admins_count = list(users_container.query_items(
-                query=query_admins,
+            # Count accounts by role and status in one query
+            role_counts = self._users_container.query_items(
+                query="SELECT c.role, c.isActive, COUNT(1) AS n FROM c GROUP BY c.role, c.isActive",
                 enable_cross_partition_query=True
-            ))[0]
+            )
             
-            # Count pharmacies
-            query_pharmacies = "SELECT VALUE COUNT(1) FROM c WHERE c.role = 'pharmacy'"
-            pharmacies_count = list(users_container.query_items(
-                query=query_pharmacies,
-                enable_cross_partition_query=True
-            ))[0]
-            
-            # Count labs
-            query_labs = "SELECT VALUE COUNT(1) FROM c WHERE c.role = 'laboratory'"
-            labs_count = list(users_container.query_items(
-                query=query_labs,
-                enable_cross_partition_query=True
-            ))[0]
+            active_doctors_count = 0
+            inactive_doctors_count = 0
+            admins_count = 0
+            pharmacies_count = 0
+            labs_count = 0
+            for group in role_counts:
+                role = group.get('role')
+                if role == 'doctor':
+                    # Doctors without an isActive flag are counted as neither
+                    if group.get('isActive') is True:
+                        active_doctors_count += group['n']
+                    elif group.get('isActive') is False:
+                        inactive_doctors_count += group['n']
+                elif role == 'admin':
+                    admins_count += group['n']
+                elif role == 'pharmacy':
+                    pharmacies_count += group['n']
+                elif role == 'laboratory':
+                    labs_count += group['n']
             
             # Get list of containers to count patients, visits, etc.
-            containers = list(database.list_containers())
+            containers = list(self._database.list_containers())
             
             # Initialize counters
             total_patients = 0
@@ -595,62 +953,17 @@ class AzureServices:
             total_prescriptions = 0
             total_lab_tests = 0
             
-            # Count patient-related data
-            for container_info in containers:
-                container_name = container_info['id']
-                
-                # Skip the users container
-                if container_name == self.config['cosmos_users_container']:
-                    continue
-                
-                # Check if this is a patients container
-                if container_name.startswith('patients-'):
-                    container = database.get_container_client(container_name)
-                    
-                    # Count patients
-                    query_patients = "SELECT VALUE COUNT(1) FROM c WHERE c.type = 'patient' AND c.isDeleted = false"
-                    try:
-                        patients_count = list(container.query_items(
-                            query=query_patients,
-                            enable_cross_partition_query=True
-                        ))[0]
-                        total_patients += patients_count
-                    except:
-                        # Skip if the query fails (e.g., if the container doesn't have the expected schema)
-                        pass
-                    
-                    # Count visits
-                    query_visits = "SELECT VALUE COUNT(1) FROM c WHERE c.type = 'visit' AND c.isDeleted = false"
-                    try:
-                        visits_count = list(container.query_items(
-                            query=query_visits,
-                            enable_cross_partition_query=True
-                        ))[0]
-                        total_visits += visits_count
-                    except:
-                        pass
-                    
-                    # Count prescriptions
-                    query_prescriptions = "SELECT VALUE COUNT(1) FROM c WHERE c.type = 'prescription' AND c.isDeleted = false"
-                    try:
-                        prescriptions_count = list(container.query_items(
-                            query=query_prescriptions,
-                            enable_cross_partition_query=True
-                        ))[0]
-                        total_prescriptions += prescriptions_count
-                    except:
-                        pass
-                    
-                    # Count lab tests
-                    query_lab_tests = "SELECT VALUE COUNT(1) FROM c WHERE c.type = 'labTest' AND c.isDeleted = false"
-                    try:
-                        lab_tests_count = list(container.query_items(
-                            query=query_lab_tests,
-                            enable_cross_partition_query=True
-                        ))[0]
-                        total_lab_tests += lab_tests_count
-                    except:
-                        pass
+            # Count patient-related data, querying the patients containers in parallel
+            patient_containers = [
+                container_info['id'] for container_info in containers
+                if container_info['id'] != self.config['cosmos_users_container']
+                and container_info['id'].startswith('patients-')
+            ]
+            for type_counts in self._pool.map(self._count_patient_data, patient_containers):
+                total_patients += type_counts.get('patient', 0)
+                total_visits += type_counts.get('visit', 0)
+                total_prescriptions += type_counts.get('prescription', 0)
+                total_lab_tests += type_counts.get('labTest', 0)
             
             # Get Azure resource usage
             # (This is just a placeholder - actual implementation would require more complex Azure SDK calls)
@@ -690,11 +1003,38 @@ class AzureServices:
                     'last_updated': datetime.datetime.now().isoformat()
                 }
             }
-        except Exception as e:
-            logger.error(f"Failed to get system metrics: {str(e)}")
+        except Exception:
+            logger.exception("Failed to get system metrics")
             raise
 
 
+class TTLCache:
+    """Keeps loaded values for a fixed number of seconds."""
+    
+    def __init__(self, ttl: float) -> None:
+        """Initialize an empty cache whose entries expire after ttl seconds."""
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+    
+    def get_or_load(self, key: str, load: Callable[[], Any]) -> Any:
+        """Return the value stored under key, calling load to refresh it if missing or expired."""
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+        
+        value = load()
+        self._entries[key] = (now, value)
+        return value
+    
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop the value stored under key, or every value if no key is given."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
 class OwnerCredentials:
     """Manages the owner credentials."""
     
@@ -703,6 +1043,9 @@ class OwnerCredentials:
         self.credentials_file = credentials_file
         self.credentials = self._load_credentials()
         
+        # Whether in-memory changes such as the last login time are not yet on disk
+        self._dirty = False
+        
         # Check if credentials need to be created
         if not self.credentials:
             self._create_initial_credentials()
@@ -710,22 +1053,26 @@ class OwnerCredentials:
     def _load_credentials(self) -> Dict[str, Any]:
         """Load credentials from the JSON file."""
         try:
-            if os.path.exists(self.credentials_file):
-                with open(self.credentials_file, 'r') as f:
-                    return json.load(f)
-            else:
-                return {}
-        except Exception as e:
-            logger.error(f"Failed to load credentials: {str(e)}")
+            return _read_json_file(self.credentials_file)
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            logger.exception("Failed to load credentials")
             return {}
     
     def _save_credentials(self) -> None:
         """Save credentials to the JSON file."""
         try:
-            with open(self.credentials_file, 'w') as f:
-                json.dump(self.credentials, f, indent=4)
-        except Exception as e:
-            logger.error(f"Failed to save credentials: {str(e)}")
+            # Only the app reads this file, so it is stored without indentation
+            _write_json_file(self.credentials_file, self.credentials, indent=False)
+            self._dirty = False
+        except Exception:
+            logger.exception("Failed to save credentials")
+    
+    def flush(self) -> None:
+        """Save credentials if they have changed since the last save."""
+        if self._dirty:
+            self._save_credentials()
     
     def _create_initial_credentials(self) -> None:
         """Create the initial owner credentials."""
@@ -736,12 +1083,13 @@ class OwnerCredentials:
         hashed_password = SecurityManager.hash_password(initial_password)
         
         # Create the credentials
+        now_iso = datetime.datetime.now().isoformat()
         self.credentials = {
             'username': 'owner',
             'password_hash': hashed_password,
-            'created_at': datetime.datetime.now().isoformat(),
+            'created_at': now_iso,
             'last_login': None,
-            'last_password_change': datetime.datetime.now().isoformat(),
+            'last_password_change': now_iso,
             'require_password_change': True
         }
         
@@ -760,16 +1108,24 @@ class OwnerCredentials:
     
     def authenticate(self, username: str, password: str) -> bool:
         """Authenticate the user with the provided credentials."""
-        if username != self.credentials.get('username'):
+        # Compare usernames in constant time so a mismatch does not leak how much matched
+        stored_username = self.credentials.get('username', '').encode('utf-8')
+        if not hmac.compare_digest(username.encode('utf-8'), stored_username):
             return False
         
         # Verify the password
-        if not SecurityManager.verify_password(self.credentials.get('password_hash', ''), password):
+        password_hash = self.credentials.get('password_hash', '')
+        if not SecurityManager.verify_password(password_hash, password):
             return False
         
-        # Update last login
-        self.credentials['last_login'] = datetime.datetime.now().isoformat()
-        self._save_credentials()
+        # Update last login; it is written out with the next save or on exit
+        self.credentials['last_login'] = _iso_now_cached()
+        self._dirty = True
+        
+        # Upgrade a hash made with older settings while the password is at hand
+        if SecurityManager.needs_rehash(password_hash):
+            self.credentials['password_hash'] = SecurityManager.hash_password(password)
+            self._save_credentials()
         
         return True
     
@@ -784,11 +1140,11 @@ class OwnerCredentials:
         
         # Update the credentials
         self.credentials['password_hash'] = hashed_password
-        self.credentials['last_password_change'] = datetime.datetime.now().isoformat()
+        self.credentials['last_password_change'] = _iso_now_cached()
         self.credentials['require_password_change'] = False
         
-        # Save the credentials
-        self._save_credentials()
+        # The caller saves with flush() before confirming the change
+        self._dirty = True
         
         return True
     
@@ -802,7 +1158,7 @@ class OwnerCredentials:
         
         # Update the credentials
         self.credentials['password_hash'] = hashed_password
-        self.credentials['last_password_change'] = datetime.datetime.now().isoformat()
+        self.credentials['last_password_change'] = _iso_now_cached()
         self.credentials['require_password_change'] = True
         
         # Save the credentials
@@ -822,82 +1178,110 @@ class OwnerApp:
         """Initialize the owner application."""
         self.config = self._load_config(config_file)
         self.credentials = OwnerCredentials()
+        atexit.register(self.credentials.flush)
         
         # Check if the user is authenticated
         self.authenticated = False
         
+        # Whether a password is being hashed on a worker thread
+        self._password_check_running = False
+        
+        # Marker of the row insertion in progress for each treeview, by widget path
+        self._tree_fills: Dict[str, object] = {}
+        
+        # Recently fetched admin and doctor accounts, shared by the lists and dialogs
+        self._account_cache = TTLCache(ACCOUNT_CACHE_TTL)
+        
+        # Azure services, connected after sign-in
+        self.azure: Optional[AzureServices] = None
+        
         # Create the main window
         self.root = tk.Tk()
         self.root.title("Medical Practice Owner Control")
         self.root.geometry("1200x800")
         self.root.minsize(800, 600)
         
+        # Register the Tcl helper used to insert treeview rows in bulk
+        self.root.tk.eval(TREE_INSERT_ROWS_PROC)
+        
+        # Each screen is one frame, built on first use and then shown or hidden
+        self._login_frame: Optional[ttk.Frame] = None
+        self._password_frame: Optional[ttk.Frame] = None
+        self._main_built = False
+        
         # Set up the UI
         self._show_login_screen()
     
     def _load_config(self, config_file: str) -> Dict[str, Any]:
         """Load configuration from a JSON file."""
         try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-            return config
+            return _read_json_file(config_file)
         except FileNotFoundError:
             # Create a default config file if it doesn't exist
-            default_config = {
-                "azure_tenant_id": "",
-                "azure_client_id": "",
-                "azure_client_secret": "",
-                "subscription_id": "",
-                "cosmos_endpoint": "",
-                "cosmos_key": "",
-                "cosmos_database": "medical_practice",
-                "cosmos_users_container": "users",
-                "storage_account_name": "",
-                "storage_account_key": ""
-            }
-            with open(config_file, 'w') as f:
-                json.dump(default_config, f, indent=4)
+            default_config = dict(DEFAULT_CONFIG)
+            _write_json_file(config_file, default_config)
             
             logger.warning(f"Config file not found. Created default config at {config_file}")
             return default_config
-        except Exception as e:
-            logger.error(f"Failed to load config: {str(e)}")
+        except Exception:
+            logger.exception("Failed to load config")
             raise
     
+    def _hide_all(self) -> None:
+        """Hide whichever screen is showing; screens are kept for reuse rather than destroyed."""
+        for frame in (self._login_frame, self._password_frame):
+            if frame is not None:
+                frame.pack_forget()
+        if self._main_built:
+            self.notebook.pack_forget()
+        self.root.unbind("<Return>")
+    
     def _show_login_screen(self) -> None:
         """Show the login screen."""
-        # Clear the window
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self._hide_all()
+        
+        if self._login_frame is None:
+            self._build_login_frame()
+        else:
+            # Reset the form left over from the previous login
+            self._password_var.set("")
+            self._login_button.state(['!disabled'])
+            self._login_status.config(text="")
+        self._login_frame.pack(expand=True)
         
+        # Bind Enter key to login
+        self.root.bind("<Return>", lambda event: self._handle_login(self._username_var.get(), self._password_var.get()))
+    
+    def _build_login_frame(self) -> None:
+        """Create the login form."""
         # Create a frame for the login form
-        login_frame = ttk.Frame(self.root, padding=20)
-        login_frame.pack(expand=True)
+        login_frame = self._login_frame = ttk.Frame(self.root, padding=20)
         
         # Create the login form
         ttk.Label(login_frame, text="Medical Practice Owner Control", font=("TkDefaultFont", 16, "bold")).grid(row=0, column=0, columnspan=2, pady=(0, 20))
         
         ttk.Label(login_frame, text="Username:").grid(row=1, column=0, sticky="e", padx=10, pady=5)
-        username_var = tk.StringVar()
-        ttk.Entry(login_frame, textvariable=username_var, width=30).grid(row=1, column=1, sticky="w", padx=10, pady=5)
+        self._username_var = tk.StringVar()
+        ttk.Entry(login_frame, textvariable=self._username_var, width=30).grid(row=1, column=1, sticky="w", padx=10, pady=5)
         
         ttk.Label(login_frame, text="Password:").grid(row=2, column=0, sticky="e", padx=10, pady=5)
-        password_var = tk.StringVar()
-        ttk.Entry(login_frame, textvariable=password_var, show="*", width=30).grid(row=2, column=1, sticky="w", padx=10, pady=5)
+        self._password_var = tk.StringVar()
+        ttk.Entry(login_frame, textvariable=self._password_var, show="*", width=30).grid(row=2, column=1, sticky="w", padx=10, pady=5)
         
         # Create a button frame
         button_frame = ttk.Frame(login_frame)
         button_frame.grid(row=3, column=0, columnspan=2, pady=(20, 0))
         
-        login_button = ttk.Button(
+        self._login_button = ttk.Button(
             button_frame,
             text="Login",
-            command=lambda: self._handle_login(username_var.get(), password_var.get())
+            command=lambda: self._handle_login(self._username_var.get(), self._password_var.get())
         )
-        login_button.pack(side=tk.RIGHT, padx=5)
+        self._login_button.pack(side=tk.RIGHT, padx=5)
         
-        # Bind Enter key to login
-        self.root.bind("<Return>", lambda event: self._handle_login(username_var.get(), password_var.get()))
+        # Status shown while the password is being checked
+        self._login_status = ttk.Label(login_frame, text="")
+        self._login_status.grid(row=4, column=0, columnspan=2, pady=(10, 0))
     
     def _handle_login(self, username: str, password: str) -> None:
         """Handle the login process."""
@@ -905,8 +1289,17 @@ class OwnerApp:
             messagebox.showerror("Error", "Please enter both username and password.")
             return
         
-        # Authenticate the user
-        if self.credentials.authenticate(username, password):
+        # Authenticate the user on a worker thread; the form stays disabled meanwhile
+        self._login_button.state(['disabled'])
+        self._login_status.config(text="Verifying...")
+        self._run_password_check(
+            lambda: self.credentials.authenticate(username, password),
+            self._finish_login
+        )
+    
+    def _finish_login(self, authenticated: bool) -> None:
+        """Continue the login process once the password has been checked."""
+        if authenticated:
             self.authenticated = True
             
             # Check if password change is required
@@ -915,47 +1308,78 @@ class OwnerApp:
             else:
                 self._load_main_app()
         else:
+            self._login_button.state(['!disabled'])
+            self._login_status.config(text="")
             messagebox.showerror("Error", "Invalid credentials. Please try again.")
     
+    def _run_password_check(self, check: Callable[[], bool], on_done: Callable[[bool], None]) -> None:
+        """Run a call that hashes a password on a worker thread, then pass its result to on_done.
+        
+        Hashing takes long enough to freeze the window; the KDF releases the GIL,
+        so the UI keeps redrawing while it runs. Repeated requests are ignored
+        until the running check finishes.
+        """
+        if self._password_check_running:
+            return
+        self._password_check_running = True
+        
+        def worker() -> None:
+            try:
+                result = check()
+            except Exception:
+                logger.exception("Password check failed")
+                result = False
+            self.root.after(0, lambda: self._finish_password_check(on_done, result))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _finish_password_check(self, on_done: Callable[[bool], None], result: bool) -> None:
+        """Hand a password check result to its callback on the UI thread."""
+        self._password_check_running = False
+        on_done(result)
+    
     def _show_password_change_screen(self) -> None:
         """Show the password change screen."""
-        # Clear the window
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self._hide_all()
         
+        if self._password_frame is None:
+            self._build_password_frame()
+        self._password_frame.pack(expand=True)
+    
+    def _build_password_frame(self) -> None:
+        """Create the password change form."""
         # Create a frame for the password change form
-        password_frame = ttk.Frame(self.root, padding=20)
-        password_frame.pack(expand=True)
+        password_frame = self._password_frame = ttk.Frame(self.root, padding=20)
         
         # Create the password change form
         ttk.Label(password_frame, text="Change Password", font=("TkDefaultFont", 16, "bold")).grid(row=0, column=0, columnspan=2, pady=(0, 20))
         
         ttk.Label(password_frame, text="Current Password:").grid(row=1, column=0, sticky="e", padx=10, pady=5)
-        current_password_var = tk.StringVar()
-        ttk.Entry(password_frame, textvariable=current_password_var, show="*", width=30).grid(row=1, column=1, sticky="w", padx=10, pady=5)
+        self._current_password_var = tk.StringVar()
+        ttk.Entry(password_frame, textvariable=self._current_password_var, show="*", width=30).grid(row=1, column=1, sticky="w", padx=10, pady=5)
         
         ttk.Label(password_frame, text="New Password:").grid(row=2, column=0, sticky="e", padx=10, pady=5)
-        new_password_var = tk.StringVar()
-        ttk.Entry(password_frame, textvariable=new_password_var, show="*", width=30).grid(row=2, column=1, sticky="w", padx=10, pady=5)
+        self._new_password_var = tk.StringVar()
+        ttk.Entry(password_frame, textvariable=self._new_password_var, show="*", width=30).grid(row=2, column=1, sticky="w", padx=10, pady=5)
         
         ttk.Label(password_frame, text="Confirm New Password:").grid(row=3, column=0, sticky="e", padx=10, pady=5)
-        confirm_password_var = tk.StringVar()
-        ttk.Entry(password_frame, textvariable=confirm_password_var, show="*", width=30).grid(row=3, column=1, sticky="w", padx=10, pady=5)
+        self._confirm_password_var = tk.StringVar()
+        ttk.Entry(password_frame, textvariable=self._confirm_password_var, show="*", width=30).grid(row=3, column=1, sticky="w", padx=10, pady=5)
         
         # Create a button frame
         button_frame = ttk.Frame(password_frame)
         button_frame.grid(row=4, column=0, columnspan=2, pady=(20, 0))
         
-        change_button = ttk.Button(
+        self._change_button = ttk.Button(
             button_frame,
             text="Change Password",
             command=lambda: self._handle_password_change(
-                current_password_var.get(),
-                new_password_var.get(),
-                confirm_password_var.get()
+                self._current_password_var.get(),
+                self._new_password_var.get(),
+                self._confirm_password_var.get()
             )
         )
-        change_button.pack(side=tk.RIGHT, padx=5)
+        self._change_button.pack(side=tk.RIGHT, padx=5)
     
     def _handle_password_change(self, current_password: str, new_password: str, confirm_password: str) -> None:
         """Handle the password change process."""
@@ -971,30 +1395,61 @@ class OwnerApp:
             messagebox.showerror("Error", "New password must be at least 8 characters long.")
             return
         
-        # Change the password
-        if self.credentials.change_password(current_password, new_password):
-            messagebox.showinfo("Success", "Password changed successfully.")
-            self._load_main_app()
-        else:
-            messagebox.showerror("Error", "Current password is incorrect.")
+        def on_changed(changed: bool) -> None:
+            if changed:
+                self.credentials.flush()
+                messagebox.showinfo("Success", "Password changed successfully.")
+                self._load_main_app()
+            else:
+                self._change_button.state(['!disabled'])
+                messagebox.showerror("Error", "Current password is incorrect.")
+        
+        # Change the password on a worker thread; the button stays disabled meanwhile
+        self._change_button.state(['disabled'])
+        self._run_password_check(
+            lambda: self.credentials.change_password(current_password, new_password),
+            on_changed
+        )
+    
+    def _connect_azure(self) -> None:
+        """Connect to Azure with the current config, closing the previous connection.
+        
+        If the new connection fails, the previous one is kept.
+        """
+        previous = self.azure
+        self.azure = AzureServices(self.config)
+        self._account_cache.invalidate()
+        if previous is not None:
+            previous.close()
     
     def _load_main_app(self) -> None:
         """Load the main application after successful authentication."""
-        # Clear the window
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self._hide_all()
         
         # Initialize Azure services
         try:
-            self.azure = AzureServices(self.config)
+            self._connect_azure()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to initialize Azure services: {str(e)}")
             self._show_login_screen()
             return
         
+        # Build the notebook the first time the main app is shown, then reuse it
+        if not self._main_built:
+            self._build_main_ui()
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Reload the tabs opened so far, then build the selected tab if it is new
+        for tab in self._tabs_built:
+            loader = self._tabs[tab][1]
+            if loader is not None:
+                loader()
+        self._on_tab_changed(None)
+    
+    def _build_main_ui(self) -> None:
+        """Create the main notebook with all of its tabs and menus."""
         # Create a notebook with tabs
         self.notebook = ttk.Notebook(self.root)
-        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Create frames for tabs
         self.dashboard_frame = ttk.Frame(self.notebook)
@@ -1012,28 +1467,31 @@ class OwnerApp:
         self.notebook.add(self.system_frame, text="System Operations")
         self.notebook.add(self.settings_frame, text="Settings")
         
-        # Set up the dashboard tab
-        self._setup_dashboard_tab()
-        
-        # Set up the admins tab
-        self._setup_admins_tab()
-        
-        # Set up the doctors tab
-        self._setup_doctors_tab()
-        
-        # Set up the data management tab
-        self._setup_data_tab()
-        
-        # Set up the system operations tab
-        self._setup_system_tab()
+        # Each tab is built, and its data loaded, the first time it is selected
+        self._tabs: Dict[str, Tuple[Callable[[], None], Optional[Callable[[], None]]]] = {
+            str(self.dashboard_frame): (self._setup_dashboard_tab, self._load_dashboard_data),
+            str(self.admins_frame): (self._setup_admins_tab, self._load_admins),
+            str(self.doctors_frame): (self._setup_doctors_tab, self._load_doctors),
+            str(self.data_frame): (self._setup_data_tab, None),
+            str(self.system_frame): (self._setup_system_tab, None),
+            str(self.settings_frame): (self._setup_settings_tab, None)
+        }
+        self._tabs_built: Set[str] = set()
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         
-        # Set up the settings tab
-        self._setup_settings_tab()
+        self._main_built = True
+    
+    def _on_tab_changed(self, event) -> None:
+        """Build the selected tab and load its data on first selection."""
+        tab = self.notebook.select()
+        if tab in self._tabs_built:
+            return
+        self._tabs_built.add(tab)
         
-        # Load the initial data
-        self._load_dashboard_data()
-        self._load_admins()
-        self._load_doctors()
+        builder, loader = self._tabs[tab]
+        builder()
+        if loader is not None:
+            loader()
     
     def _setup_dashboard_tab(self) -> None:
         """Set up the dashboard tab UI."""
@@ -1045,6 +1503,10 @@ class OwnerApp:
         refresh_button = ttk.Button(button_frame, text="Refresh", command=self._load_dashboard_data)
         refresh_button.pack(side=tk.LEFT, padx=5)
         
+        # Status shown while metrics are loading
+        self._dashboard_status = ttk.Label(button_frame, text="")
+        self._dashboard_status.pack(side=tk.LEFT, padx=5)
+        
         # Create a frame for the system metrics
         metrics_frame = ttk.LabelFrame(self.dashboard_frame, text="System Metrics")
         metrics_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -1052,6 +1514,54 @@ class OwnerApp:
         # Create a frame for the metrics content
         self.metrics_content = ttk.Frame(metrics_frame, padding=10)
         self.metrics_content.pack(fill=tk.BOTH, expand=True)
+        
+        self._build_dashboard_widgets()
+    
+    def _build_dashboard_widgets(self) -> None:
+        """Create the dashboard sections once; refreshes only change their text and values."""
+        # Create a frame for each section
+        accounts_frame = ttk.LabelFrame(self.metrics_content, text="Accounts")
+        accounts_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+        
+        data_frame = ttk.LabelFrame(self.metrics_content, text="Data")
+        data_frame.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
+        
+        resources_frame = ttk.LabelFrame(self.metrics_content, text="Resources")
+        resources_frame.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=10, pady=10)
+        
+        # Configure grid
+        self.metrics_content.grid_columnconfigure(0, weight=1)
+        self.metrics_content.grid_columnconfigure(1, weight=1)
+        self.metrics_content.grid_rowconfigure(0, weight=1)
+        self.metrics_content.grid_rowconfigure(1, weight=1)
+        
+        # Caption and value labels for the accounts and data sections
+        self._dashboard_labels: Dict[str, ttk.Label] = {}
+        for frame, rows in ((accounts_frame, DASHBOARD_ACCOUNT_ROWS), (data_frame, DASHBOARD_DATA_ROWS)):
+            for row, (caption, key) in enumerate(rows):
+                ttk.Label(frame, text=caption).grid(row=row, column=0, sticky="w", padx=5, pady=2)
+                label = self._dashboard_labels[key] = ttk.Label(frame, text="")
+                label.grid(row=row, column=1, sticky="w", padx=5, pady=2)
+        
+        # Storage and database usage, each with a progress bar
+        self._dashboard_progress: Dict[str, ttk.Progressbar] = {}
+        for key, caption in (("storage", "Storage Usage:"), ("database", "Database Usage:")):
+            usage_frame = ttk.Frame(resources_frame)
+            usage_frame.pack(fill=tk.X, padx=10, pady=5)
+            
+            ttk.Label(usage_frame, text=caption).pack(side=tk.LEFT, padx=5)
+            label = self._dashboard_labels[key] = ttk.Label(usage_frame, text="")
+            label.pack(side=tk.LEFT, padx=5)
+            
+            progress = self._dashboard_progress[key] = ttk.Progressbar(usage_frame, orient=tk.HORIZONTAL, length=200, mode='determinate')
+            progress.pack(side=tk.LEFT, padx=5)
+        
+        # Last updated
+        last_updated_frame = ttk.Frame(resources_frame)
+        last_updated_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        label = self._dashboard_labels["last_updated"] = ttk.Label(last_updated_frame, text="")
+        label.pack(side=tk.LEFT, padx=5)
     
     def _setup_admins_tab(self) -> None:
         """Set up the admins tab UI."""
@@ -1060,7 +1570,7 @@ class OwnerApp:
         button_frame.pack(fill=tk.X, padx=10, pady=10)
         
         # Add a refresh button
-        refresh_button = ttk.Button(button_frame, text="Refresh", command=self._load_admins)
+        refresh_button = ttk.Button(button_frame, text="Refresh", command=self._refresh_admins)
         refresh_button.pack(side=tk.LEFT, padx=5)
         
         # Add a new admin button
@@ -1119,7 +1629,7 @@ class OwnerApp:
         button_frame.pack(fill=tk.X, padx=10, pady=10)
         
         # Add a refresh button
-        refresh_button = ttk.Button(button_frame, text="Refresh", command=self._load_doctors)
+        refresh_button = ttk.Button(button_frame, text="Refresh", command=self._refresh_doctors)
         refresh_button.pack(side=tk.LEFT, padx=5)
         
         # Create a frame for the treeview and scrollbar
@@ -1255,78 +1765,25 @@ class OwnerApp:
         azure_container = ttk.Frame(azure_frame, padding=10)
         azure_container.pack(fill=tk.BOTH, expand=True)
         
-        # Create the Azure settings fields
+        # Create the Azure settings fields, with a separator between sections
+        self._setting_entries: Dict[str, ttk.Entry] = {}
+        config = self.config
         row = 0
         
-        # Azure AD settings
-        ttk.Label(azure_container, text="Azure AD Settings", font=("TkDefaultFont", 12, "bold")).grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
-        row += 1
-        
-        ttk.Label(azure_container, text="Tenant ID:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.tenant_id_var = tk.StringVar(value=self.config.get("azure_tenant_id", ""))
-        ttk.Entry(azure_container, textvariable=self.tenant_id_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(azure_container, text="Client ID:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.client_id_var = tk.StringVar(value=self.config.get("azure_client_id", ""))
-        ttk.Entry(azure_container, textvariable=self.client_id_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(azure_container, text="Client Secret:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.client_secret_var = tk.StringVar(value=self.config.get("azure_client_secret", ""))
-        ttk.Entry(azure_container, textvariable=self.client_secret_var, width=50, show="*").grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(azure_container, text="Subscription ID:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.subscription_id_var = tk.StringVar(value=self.config.get("subscription_id", ""))
-        ttk.Entry(azure_container, textvariable=self.subscription_id_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        # Add a separator
-        ttk.Separator(azure_container, orient="horizontal").grid(row=row, column=0, columnspan=2, sticky="ew", pady=10)
-        row += 1
-        
-        # Cosmos DB settings
-        ttk.Label(azure_container, text="Cosmos DB Settings", font=("TkDefaultFont", 12, "bold")).grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
-        row += 1
-        
-        ttk.Label(azure_container, text="Cosmos Endpoint:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.cosmos_endpoint_var = tk.StringVar(value=self.config.get("cosmos_endpoint", ""))
-        ttk.Entry(azure_container, textvariable=self.cosmos_endpoint_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(azure_container, text="Cosmos Key:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.cosmos_key_var = tk.StringVar(value=self.config.get("cosmos_key", ""))
-        ttk.Entry(azure_container, textvariable=self.cosmos_key_var, width=50, show="*").grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(azure_container, text="Database Name:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.cosmos_database_var = tk.StringVar(value=self.config.get("cosmos_database", "medical_practice"))
-        ttk.Entry(azure_container, textvariable=self.cosmos_database_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(azure_container, text="Users Container:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.cosmos_users_container_var = tk.StringVar(value=self.config.get("cosmos_users_container", "users"))
-        ttk.Entry(azure_container, textvariable=self.cosmos_users_container_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        # Add a separator
-        ttk.Separator(azure_container, orient="horizontal").grid(row=row, column=0, columnspan=2, sticky="ew", pady=10)
-        row += 1
-        
-        # Storage settings
-        ttk.Label(azure_container, text="Blob Storage Settings", font=("TkDefaultFont", 12, "bold")).grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
-        row += 1
-        
-        ttk.Label(azure_container, text="Storage Account:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.storage_account_var = tk.StringVar(value=self.config.get("storage_account_name", ""))
-        ttk.Entry(azure_container, textvariable=self.storage_account_var, width=50).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
-        
-        ttk.Label(azure_container, text="Storage Key:").grid(row=row, column=0, sticky="w", padx=5, pady=5)
-        self.storage_key_var = tk.StringVar(value=self.config.get("storage_account_key", ""))
-        ttk.Entry(azure_container, textvariable=self.storage_key_var, width=50, show="*").grid(row=row, column=1, sticky="ew", padx=5, pady=5)
-        row += 1
+        for index, (heading, fields) in enumerate(SETTINGS_SECTIONS):
+            if index:
+                ttk.Separator(azure_container, orient="horizontal").grid(row=row, column=0, columnspan=2, sticky="ew", pady=10)
+                row += 1
+            
+            ttk.Label(azure_container, text=heading, font=("TkDefaultFont", 12, "bold")).grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
+            row += 1
+            
+            for label, key, default, show in fields:
+                ttk.Label(azure_container, text=label).grid(row=row, column=0, sticky="w", padx=5, pady=5)
+                entry = self._setting_entries[key] = ttk.Entry(azure_container, width=50, show=show)
+                entry.insert(0, config.get(key, default))
+                entry.grid(row=row, column=1, sticky="ew", padx=5, pady=5)
+                row += 1
         
         # Add save button
         button_frame = ttk.Frame(azure_frame)
@@ -1353,16 +1810,11 @@ class OwnerApp:
     def _load_dashboard_data(self) -> None:
         """Load data for the dashboard."""
         try:
-            # Clear the metrics content
-            for widget in self.metrics_content.winfo_children():
-                widget.destroy()
-            
-            # Add a loading label
-            loading_label = ttk.Label(self.metrics_content, text="Loading metrics...")
-            loading_label.pack()
+            # Show a loading status; the current figures stay until new ones arrive
+            self._dashboard_status.configure(text="Loading metrics...")
             
             # Start loading in a separate thread
-            threading.Thread(target=self._load_dashboard_thread).start()
+            threading.Thread(target=self._load_dashboard_thread, daemon=True).start()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load dashboard data: {str(e)}")
     
@@ -1372,163 +1824,120 @@ class OwnerApp:
             # Get system metrics
             metrics = self.azure.get_system_metrics()
             
-            # Update the UI in the main thread
-            self.root.after(0, lambda: self._update_dashboard_ui(metrics))
+            # Update the UI in the main thread once it is idle, in one pass
+            self.root.after_idle(self._update_dashboard_ui, metrics)
         except Exception as e:
             # Show error message in the main thread
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to load metrics: {str(e)}"))
+            message = f"Failed to load metrics: {str(e)}"
+            self.root.after(0, lambda: self._dashboard_load_failed(message))
+    
+    def _dashboard_load_failed(self, message: str) -> None:
+        """Clear the loading status and report a failed metrics load."""
+        self._dashboard_status.configure(text="")
+        messagebox.showerror("Error", message)
     
     def _update_dashboard_ui(self, metrics: Dict[str, Any]) -> None:
         """Update the dashboard UI with the loaded metrics."""
-        # Clear the metrics content
-        for widget in self.metrics_content.winfo_children():
-            widget.destroy()
-        
-        # Create a frame for each section
-        accounts_frame = ttk.LabelFrame(self.metrics_content, text="Accounts")
-        accounts_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        
-        data_frame = ttk.LabelFrame(self.metrics_content, text="Data")
-        data_frame.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
-        
-        resources_frame = ttk.LabelFrame(self.metrics_content, text="Resources")
-        resources_frame.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=10, pady=10)
-        
-        # Configure grid
-        self.metrics_content.grid_columnconfigure(0, weight=1)
-        self.metrics_content.grid_columnconfigure(1, weight=1)
-        self.metrics_content.grid_rowconfigure(0, weight=1)
-        self.metrics_content.grid_rowconfigure(1, weight=1)
+        labels = self._dashboard_labels
+        self._dashboard_status.configure(text="")
         
         # Populate accounts section
         accounts = metrics.get('accounts', {})
-        row = 0
-        
-        # Doctors
-        ttk.Label(accounts_frame, text="Doctors:").grid(row=row, column=0, sticky="w", padx=5, pady=2)
-        ttk.Label(accounts_frame, text=f"Active: {accounts.get('doctors', {}).get('active', 0)}").grid(row=row, column=1, sticky="w", padx=5, pady=2)
-        row += 1
-        
-        ttk.Label(accounts_frame, text="").grid(row=row, column=0, sticky="w", padx=5, pady=2)
-        ttk.Label(accounts_frame, text=f"Inactive: {accounts.get('doctors', {}).get('inactive', 0)}").grid(row=row, column=1, sticky="w", padx=5, pady=2)
-        row += 1
-        
-        ttk.Label(accounts_frame, text="").grid(row=row, column=0, sticky="w", padx=5, pady=2)
-        ttk.Label(accounts_frame, text=f"Total: {accounts.get('doctors', {}).get('total', 0)}").grid(row=row, column=1, sticky="w", padx=5, pady=2)
-        row += 1
-        
-        # Admins
-        ttk.Label(accounts_frame, text="Admins:").grid(row=row, column=0, sticky="w", padx=5, pady=2)
-        ttk.Label(accounts_frame, text=f"{accounts.get('admins', 0)}").grid(row=row, column=1, sticky="w", padx=5, pady=2)
-        row += 1
-        
-        # Pharmacies
-        ttk.Label(accounts_frame, text="Pharmacies:").grid(row=row, column=0, sticky="w", padx=5, pady=2)
-        ttk.Label(accounts_frame, text=f"{accounts.get('pharmacies', 0)}").grid(row=row, column=1, sticky="w", padx=5, pady=2)
-        row += 1
-        
-        # Labs
-        ttk.Label(accounts_frame, text="Labs:").grid(row=row, column=0, sticky="w", padx=5, pady=2)
-        ttk.Label(accounts_frame, text=f"{accounts.get('labs', 0)}").grid(row=row, column=1, sticky="w", padx=5, pady=2)
-        row += 1
+        doctors = accounts.get('doctors', {})
+        labels['doctors_active'].configure(text=f"Active: {doctors.get('active', 0)}")
+        labels['doctors_inactive'].configure(text=f"Inactive: {doctors.get('inactive', 0)}")
+        labels['doctors_total'].configure(text=f"Total: {doctors.get('total', 0)}")
+        for key in ('admins', 'pharmacies', 'labs'):
+            labels[key].configure(text=f"{accounts.get(key, 0)}")
         
         # Populate data section
         data = metrics.get('data', {})
-        row = 0
-        
-        # Patients
-        ttk.Label(data_frame, text="Patients:").grid(row=row, column=0, sticky="w", padx=5, pady=2)
-        ttk.Label(data_frame, text=f"{data.get('patients', 0)}").grid(row=row, column=1, sticky="w", padx=5, pady=2)
-        row += 1
-        
-        # Visits
-        ttk.Label(data_frame, text="Visits:").grid(row=row, column=0, sticky="w", padx=5, pady=2)
-        ttk.Label(data_frame, text=f"{data.get('visits', 0)}").grid(row=row, column=1, sticky="w", padx=5, pady=2)
-        row += 1
-        
-        # Prescriptions
-        ttk.Label(data_frame, text="Prescriptions:").grid(row=row, column=0, sticky="w", padx=5, pady=2)
-        ttk.Label(data_frame, text=f"{data.get('prescriptions', 0)}").grid(row=row, column=1, sticky="w", padx=5, pady=2)
-        row += 1
-        
-        # Lab tests
-        ttk.Label(data_frame, text="Lab Tests:").grid(row=row, column=0, sticky="w", padx=5, pady=2)
-        ttk.Label(data_frame, text=f"{data.get('lab_tests', 0)}").grid(row=row, column=1, sticky="w", padx=5, pady=2)
-        row += 1
+        for _, key in DASHBOARD_DATA_ROWS:
+            labels[key].configure(text=f"{data.get(key, 0)}")
         
         # Populate resources section
         resources = metrics.get('resources', {})
         
         # Storage
         storage = resources.get('storage', {})
-        storage_frame = ttk.Frame(resources_frame)
-        storage_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        ttk.Label(storage_frame, text="Storage Usage:").pack(side=tk.LEFT, padx=5)
-        ttk.Label(storage_frame, text=f"{storage.get('used_gb', 0)} GB / {storage.get('total_gb', 0)} GB ({storage.get('percent_used', 0)}%)").pack(side=tk.LEFT, padx=5)
-        
-        # Create a progress bar for storage
-        storage_progress = ttk.Progressbar(storage_frame, orient=tk.HORIZONTAL, length=200, mode='determinate')
-        storage_progress.pack(side=tk.LEFT, padx=5)
-        storage_progress['value'] = storage.get('percent_used', 0)
+        labels['storage'].configure(text=f"{storage.get('used_gb', 0)} GB / {storage.get('total_gb', 0)} GB ({storage.get('percent_used', 0)}%)")
+        self._dashboard_progress['storage']['value'] = storage.get('percent_used', 0)
         
         # Database
         database = resources.get('database', {})
-        database_frame = ttk.Frame(resources_frame)
-        database_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        ttk.Label(database_frame, text="Database Usage:").pack(side=tk.LEFT, padx=5)
-        ttk.Label(database_frame, text=f"{database.get('ru_consumed', 0)} RU/s / {database.get('ru_provisioned', 0)} RU/s ({database.get('percent_used', 0)}%)").pack(side=tk.LEFT, padx=5)
-        
-        # Create a progress bar for database
-        database_progress = ttk.Progressbar(database_frame, orient=tk.HORIZONTAL, length=200, mode='determinate')
-        database_progress.pack(side=tk.LEFT, padx=5)
-        database_progress['value'] = database.get('percent_used', 0)
+        labels['database'].configure(text=f"{database.get('ru_consumed', 0)} RU/s / {database.get('ru_provisioned', 0)} RU/s ({database.get('percent_used', 0)}%)")
+        self._dashboard_progress['database']['value'] = database.get('percent_used', 0)
         
         # Last updated
         last_updated = resources.get('last_updated', '')
-        last_updated_frame = ttk.Frame(resources_frame)
-        last_updated_frame.pack(fill=tk.X, padx=10, pady=5)
-        
         try:
             last_updated_dt = datetime.datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
             last_updated_str = last_updated_dt.strftime("%Y-%m-%d %H:%M:%S")
         except:
             last_updated_str = last_updated
         
-        ttk.Label(last_updated_frame, text=f"Last Updated: {last_updated_str}").pack(side=tk.LEFT, padx=5)
+        labels['last_updated'].configure(text=f"Last Updated: {last_updated_str}")
+    
+    def _get_accounts(self, kind: str) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Return the 'admins' or 'doctors' accounts as a list and by ID, reusing a recent fetch."""
+        def fetch() -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+            if kind == 'admins':
+                accounts = self.azure.get_admin_accounts()
+            else:
+                accounts = self.azure.get_doctor_accounts()
+            return accounts, {account.get('id'): account for account in accounts}
+        
+        return self._account_cache.get_or_load(kind, fetch)
+    
+    def _refresh_admins(self) -> None:
+        """Reload admin accounts from Azure, bypassing the account cache."""
+        self._account_cache.invalidate('admins')
+        self._load_admins()
+    
+    def _refresh_doctors(self) -> None:
+        """Reload doctor accounts from Azure, bypassing the account cache."""
+        self._account_cache.invalidate('doctors')
+        self._load_doctors()
     
     def _load_admins(self) -> None:
         """Load admin accounts from the database."""
         # Clear the treeview
-        self.admins_tree.delete(*self.admins_tree.get_children())
+        self._clear_tree(self.admins_tree)
         
         try:
             # Start loading in a separate thread
-            threading.Thread(target=self._load_admins_thread).start()
+            threading.Thread(target=self._load_admins_thread, daemon=True).start()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load admins: {str(e)}")
     
     def _load_admins_thread(self) -> None:
         """Load admin accounts in a separate thread."""
         try:
-            # Get admins from Azure
-            admins = self.azure.get_admin_accounts()
+            # Get admins from Azure, or from a fetch made moments ago
+            admins, _ = self._get_accounts('admins')
+            
+            # Sort admins by name; the cached list itself is left as fetched
+            admins = sorted(admins, key=lambda x: x.get('displayName', ''))
             
-            # Sort admins by name
-            admins.sort(key=lambda x: x.get('displayName', ''))
+            # Format the rows here too, so the main thread only inserts them
+            rows = self._build_admin_rows(admins)
             
             # Update the UI in the main thread
-            self.root.after(0, lambda: self._populate_admins_tree(admins))
+            self.root.after(0, lambda: self._populate_admins_tree(rows))
         except Exception as e:
             # Show error message in the main thread
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to load admins: {str(e)}"))
+            message = f"Failed to load admins: {str(e)}"
+            self.root.after(0, lambda: messagebox.showerror("Error", message))
     
-    def _populate_admins_tree(self, admins: List[Dict[str, Any]]) -> None:
-        """Populate the admins treeview with data."""
-        # Clear the treeview
-        self.admins_tree.delete(*self.admins_tree.get_children())
-        
+    def _populate_admins_tree(self, rows: List[Tuple[str, tuple]]) -> None:
+        """Replace the admins treeview contents with prepared rows."""
+        self._clear_tree(self.admins_tree)
+        self._insert_tree_rows(self.admins_tree, rows)
+    
+    @staticmethod
+    def _build_admin_rows(admins: List[Dict[str, Any]]) -> List[Tuple[str, tuple]]:
+        """Format admin records as (id, values) treeview rows; safe to call off the UI thread."""
+        rows = []
         for admin in admins:
             # Get admin data
             admin_id = admin.get('id', '')
@@ -1539,47 +1948,49 @@ class OwnerApp:
             # Format the status string
             status = "Active" if is_active else "Inactive"
             
-            # Add to treeview
-            self.admins_tree.insert(
-                "",
-                "end",
-                values=(admin_id, name, email, status),
-                tags=(admin_id,)
-            )
+            rows.append((admin_id, (admin_id, name, email, status)))
+        
+        return rows
     
     def _load_doctors(self) -> None:
         """Load doctor accounts from the database."""
         # Clear the treeview
-        self.doctors_tree.delete(*self.doctors_tree.get_children())
+        self._clear_tree(self.doctors_tree)
         
         try:
             # Start loading in a separate thread
-            threading.Thread(target=self._load_doctors_thread).start()
+            threading.Thread(target=self._load_doctors_thread, daemon=True).start()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load doctors: {str(e)}")
     
     def _load_doctors_thread(self) -> None:
         """Load doctor accounts in a separate thread."""
         try:
-            # Get doctors from Azure
-            doctors = self.azure.get_doctor_accounts()
+            # Get doctors from Azure, or from a fetch made moments ago
+            doctors, _ = self._get_accounts('doctors')
             
-            # Sort doctors by name
-            doctors.sort(key=lambda x: x.get('displayName', ''))
+            # Sort doctors by name; the cached list itself is left as fetched
+            doctors = sorted(doctors, key=lambda x: x.get('displayName', ''))
+            
+            # Format the rows here too, so the main thread only inserts them
+            rows = self._build_doctor_rows(doctors)
             
             # Update the UI in the main thread
-            self.root.after(0, lambda: self._populate_doctors_tree(doctors))
+            self.root.after(0, lambda: self._populate_doctors_tree(rows))
         except Exception as e:
             # Show error message in the main thread
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to load doctors: {str(e)}"))
+            message = f"Failed to load doctors: {str(e)}"
+            self.root.after(0, lambda: messagebox.showerror("Error", message))
     
-    def _populate_doctors_tree(self, doctors: List[Dict[str, Any]]) -> None:
-        """Populate the doctors treeview with data."""
-        # Clear the treeview
-        self.doctors_tree.delete(*self.doctors_tree.get_children())
-        
-        now = datetime.datetime.now()
-        
+    def _populate_doctors_tree(self, rows: List[Tuple[str, tuple]]) -> None:
+        """Replace the doctors treeview contents with prepared rows."""
+        self._clear_tree(self.doctors_tree)
+        self._insert_tree_rows(self.doctors_tree, rows)
+    
+    @staticmethod
+    def _build_doctor_rows(doctors: List[Dict[str, Any]]) -> List[Tuple[str, tuple]]:
+        """Format doctor records as (id, values) treeview rows; safe to call off the UI thread."""
+        rows = []
         for doctor in doctors:
             # Get doctor data
             doctor_id = doctor.get('id', '')
@@ -1608,7 +2019,8 @@ class OwnerApp:
                     start_date = start_date_dt.strftime("%Y-%m-%d")
                     end_date = end_date_dt.strftime("%Y-%m-%d")
                     
-                    days_left = (end_date_dt - now).days
+                    # Stored dates usually carry a UTC offset; compare in the same zone
+                    days_left = (end_date_dt - datetime.datetime.now(end_date_dt.tzinfo)).days
                     
                     if days_left < 0:
                         subscription_status = "Expired"
@@ -1617,7 +2029,7 @@ class OwnerApp:
                     else:
                         subscription_status = "Active"
                 except Exception as e:
-                    logger.error(f"Failed to parse dates: {str(e)}")
+                    logger.warning(f"Failed to parse dates: {str(e)}")
             
             # Format the status strings
             status = "Active" if is_active else "Inactive"
@@ -1625,13 +2037,38 @@ class OwnerApp:
             lab = f"{'Yes' if has_lab else 'No'} ({'Active' if lab_active else 'Inactive'})"
             subscription = f"{start_date} to {end_date} ({days_left} days left)"
             
-            # Add to treeview
-            self.doctors_tree.insert(
-                "",
-                "end",
-                values=(doctor_id, name, email, status, pharmacy, lab, subscription),
-                tags=(doctor_id,)
-            )
+            rows.append((doctor_id, (doctor_id, name, email, status, pharmacy, lab, subscription)))
+        
+        return rows
+    
+    def _clear_tree(self, tree: ttk.Treeview) -> None:
+        """Remove all rows from a treeview and stop any insertion still in progress."""
+        self._tree_fills.pop(str(tree), None)
+        tree.delete(*tree.get_children())
+    
+    def _insert_tree_rows(self, tree: ttk.Treeview, rows: List[Tuple[str, tuple]]) -> None:
+        """Append (id, values) rows to a treeview, tagging each row with its id.
+        
+        Rows go in TREE_INSERT_CHUNK_ROWS at a time, one chunk per event-loop
+        turn, so the window stays responsive while a long list fills in.
+        """
+        fill = self._tree_fills[str(tree)] = object()
+        self._insert_tree_chunk(tree, rows, 0, fill)
+    
+    def _insert_tree_chunk(self, tree: ttk.Treeview, rows: List[Tuple[str, tuple]], start: int, fill: object) -> None:
+        """Insert one chunk of rows, then schedule the next unless the insertion was superseded."""
+        if self._tree_fills.get(str(tree)) is not fill:
+            return
+        
+        end = start + TREE_INSERT_CHUNK_ROWS
+        chunk = rows[start:end]
+        if chunk:
+            self.root.tk.call('::owner_insert_tree_rows', str(tree), tuple(chunk))
+        
+        if end < len(rows):
+            self.root.after_idle(self._insert_tree_chunk, tree, rows, end, fill)
+        else:
+            del self._tree_fills[str(tree)]
     
     def _on_admin_double_click(self, event) -> None:
         """Handle double-click on an admin in the treeview."""
@@ -1764,7 +2201,7 @@ class OwnerApp:
             result_text.config(state=tk.DISABLED)
             
             # Reload the admins list
-            self._load_admins()
+            self._refresh_admins()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create admin account: {str(e)}")
     
@@ -1780,8 +2217,7 @@ class OwnerApp:
         
         # Get the admin data
         try:
-            admins = self.azure.get_admin_accounts()
-            admin = next((a for a in admins if a.get('id') == admin_id), None)
+            admin = self._get_accounts('admins')[1].get(admin_id)
             
             if not admin:
                 messagebox.showerror("Error", f"Admin with ID {admin_id} not found.")
@@ -1897,7 +2333,7 @@ class OwnerApp:
             dialog.destroy()
             
             # Reload the admins list
-            self._load_admins()
+            self._refresh_admins()
             
             messagebox.showinfo("Success", "Admin account updated successfully.")
         except Exception as e:
@@ -1923,7 +2359,7 @@ class OwnerApp:
             self.azure.delete_admin_account(admin_id)
             
             # Reload the admins list
-            self._load_admins()
+            self._refresh_admins()
             
             messagebox.showinfo("Success", "Admin account deleted successfully.")
         except Exception as e:
@@ -1968,8 +2404,7 @@ class OwnerApp:
         
         try:
             # Get the doctor data
-            doctors = self.azure.get_doctor_accounts()
-            doctor = next((d for d in doctors if d.get('id') == doctor_id), None)
+            doctor = self._get_accounts('doctors')[1].get(doctor_id)
             
             if not doctor:
                 messagebox.showerror("Error", f"Doctor with ID {doctor_id} not found.")
@@ -2009,13 +2444,13 @@ class OwnerApp:
                     start_date_str = start_date_dt.strftime("%Y-%m-%d")
                     end_date_str = end_date_dt.strftime("%Y-%m-%d")
                     
-                    days_left = (end_date_dt - datetime.datetime.now()).days
+                    days_left = (end_date_dt - datetime.datetime.now(end_date_dt.tzinfo)).days
                     
                     text.insert(tk.END, f"Start Date: {start_date_str}\n")
                     text.insert(tk.END, f"End Date: {end_date_str}\n")
                     text.insert(tk.END, f"Days Left: {days_left}\n\n")
                 except Exception as e:
-                    logger.error(f"Failed to parse dates: {str(e)}")
+                    logger.warning(f"Failed to parse dates: {str(e)}")
                     text.insert(tk.END, f"Start Date: {start_date}\n")
                     text.insert(tk.END, f"End Date: {end_date}\n\n")
             
@@ -2093,7 +2528,7 @@ class OwnerApp:
             self.azure.deactivate_all_accounts_for_doctor(doctor_id)
             
             # Reload the doctors list
-            self._load_doctors()
+            self._refresh_doctors()
             
             messagebox.showinfo("Success", "All accounts deactivated successfully.")
         except Exception as e:
@@ -2174,25 +2609,13 @@ class OwnerApp:
         """Save the settings to the config file."""
         try:
             # Update the config
-            self.config.update({
-                "azure_tenant_id": self.tenant_id_var.get(),
-                "azure_client_id": self.client_id_var.get(),
-                "azure_client_secret": self.client_secret_var.get(),
-                "subscription_id": self.subscription_id_var.get(),
-                "cosmos_endpoint": self.cosmos_endpoint_var.get(),
-                "cosmos_key": self.cosmos_key_var.get(),
-                "cosmos_database": self.cosmos_database_var.get(),
-                "cosmos_users_container": self.cosmos_users_container_var.get(),
-                "storage_account_name": self.storage_account_var.get(),
-                "storage_account_key": self.storage_key_var.get()
-            })
+            self.config.update({key: entry.get() for key, entry in self._setting_entries.items()})
             
             # Save the config to file
-            with open('owner_config.json', 'w') as f:
-                json.dump(self.config, f, indent=4)
+            _write_json_file('owner_config.json', self.config)
             
             # Reinitialize the Azure services
-            self.azure = AzureServices(self.config)
+            self._connect_azure()
             
             messagebox.showinfo("Success", "Settings saved successfully.")
         except Exception as e:
@@ -2277,12 +2700,20 @@ class OwnerApp:
             messagebox.showerror("Error", "New password must be at least 8 characters long.")
             return
         
+        def on_changed(changed: bool) -> None:
+            if changed:
+                self.credentials.flush()
+                messagebox.showinfo("Success", "Password changed successfully.")
+                if dialog.winfo_exists():
+                    dialog.destroy()
+            else:
+                messagebox.showerror("Error", "Current password is incorrect.")
+        
         # Change the password
-        if self.credentials.change_password(current_password, new_password):
-            messagebox.showinfo("Success", "Password changed successfully.")
-            dialog.destroy()
-        else:
-            messagebox.showerror("Error", "Current password is incorrect.")
+        self._run_password_check(
+            lambda: self.credentials.change_password(current_password, new_password),
+            on_changed
+        )
     
     def run(self) -> None:
         """Run the application."""